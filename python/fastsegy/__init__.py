@@ -1,6 +1,26 @@
 """Fast SEG-Y file parser with Rust backend."""
 __version__ = "0.1.0"
 
-from ._fastsegy import SegyFile
+from ._fastsegy import (
+    SegyFile,
+    SegyStream,
+    TRACE_OK,
+    TRACE_TRUNCATED,
+    TRACE_SAMPLE_COUNT,
+    TRACE_NON_FINITE,
+    TRACE_DENORMAL,
+    TRACE_IBM_EXPONENT,
+    transcode,
+)
 
-__all__ = ["SegyFile"]
\ No newline at end of file
+__all__ = [
+    "SegyFile",
+    "SegyStream",
+    "TRACE_OK",
+    "TRACE_TRUNCATED",
+    "TRACE_SAMPLE_COUNT",
+    "TRACE_NON_FINITE",
+    "TRACE_DENORMAL",
+    "TRACE_IBM_EXPONENT",
+    "transcode",
+]
\ No newline at end of file
@@ -1,10 +1,58 @@
 import numpy as np
-from typing import Dict, Any, Optional
+import os
+from typing import Any, BinaryIO, Callable, Dict, Iterator, Literal, Optional, Tuple, Union
+
+TRACE_OK: int
+TRACE_TRUNCATED: int
+TRACE_SAMPLE_COUNT: int
+TRACE_NON_FINITE: int
+TRACE_DENORMAL: int
+TRACE_IBM_EXPONENT: int
+
+
+def transcode(
+    src: str,
+    dst: str,
+    format: Literal[1, 2, 3, 5, 8] = 5,
+    byte_order: Literal["big", "little"] = "big",
+) -> int: ...
 
 
 class SegyFile:
-    def __init__(self, path: str) -> None: ...
+    def __init__(
+        self,
+        path: str,
+        access: Literal["normal", "sequential", "random", "willneed"] = "normal",
+        populate: bool = False,
+    ) -> None: ...
+    @property
+    def access(self) -> str: ...
+    @property
+    def trace_count(self) -> int: ...
     def get_trace(self, trace_number: int) -> np.ndarray: ...
     def get_trace_range(self, start: int, end: int) -> np.ndarray: ...
     def get_metadata(self) -> Dict[str, Any]: ...
-    def get_header(self) -> str: ...
\ No newline at end of file
+    def get_header(self) -> str: ...
+    def compute_statistics(self, max_traces: Optional[int] = None, refresh: bool = False) -> Dict[str, Any]: ...
+    def amplitude_percentile(self, p: float) -> float: ...
+    def build_index(self, field: Union[str, int], persist: bool = False) -> None: ...
+    def find_traces(self, field: Union[str, int], value_min: int, value_max: Optional[int] = None) -> np.ndarray: ...
+    def get_gather(self, field: Union[str, int], value: int) -> np.ndarray: ...
+    def get_gather_range(self, field: Union[str, int], value_min: int, value_max: int) -> np.ndarray: ...
+    def validate(self, strict: bool = False) -> Dict[str, Any]: ...
+    def prefetch(self, start: int, end: int) -> None: ...
+    def evict(self, start: int, end: int) -> None: ...
+    def map_chunks(
+        self,
+        func: Callable[[np.ndarray], Any],
+        chunk_traces: int = 1000,
+        workers: Optional[int] = None,
+    ) -> Iterator[Any]: ...
+
+
+class SegyStream:
+    def __init__(self, source: Union[str, os.PathLike, BinaryIO], chunk_traces: int = 1000) -> None: ...
+    def get_metadata(self) -> Dict[str, Any]: ...
+    def get_header(self) -> str: ...
+    def __iter__(self) -> "SegyStream": ...
+    def __next__(self) -> Tuple[np.ndarray, np.ndarray]: ...
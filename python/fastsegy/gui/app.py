@@ -16,22 +16,28 @@ from PyQt6.QtWidgets import (
     QPushButton,
     QAbstractItemView,
     QMessageBox,
-    QFileDialog, QLineEdit, QDialogButtonBox, QTextEdit
+    QFileDialog, QLineEdit, QDialogButtonBox, QTextEdit, QProgressBar
 )
 from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QKeySequence
 from pathlib import Path
 
-from fastsegy import SegyFile
 from fastsegy.gui.plotting import PlotCanvas
+from fastsegy.gui.workers import JobManager, open_segy_job, load_range_job, transform_job, undo_job, redo_job
 
 from fastsegy.gui.function_dialogs import (
     ProfileFlipWindow,
     RunningAverageWindow,
-    MedianXYFilterWindow
+    MedianXYFilterWindow,
+    AGCWindow,
+    BandpassWindow
 )
 
 from fastsegy.processing import *
 
+# Number of traces, spread evenly across the file, scanned for the display clip
+STATISTICS_TRACES = 5000
+
 
 class FunctionWindow(QDialog):
     def __init__(self, function_name):
@@ -96,15 +102,21 @@ class App(QMainWindow):
         self.sample_interval = None
         self.trace_data_shape = None
         self.trace_data_range = None
+        self.clip = None
+        self.history = None
+        self.jobs = JobManager(self)
         self.setWindowTitle("FastSegy App")
         self.setMinimumSize(1000, 700)
         self.create_menu()
         self.create_layout()
+        self.create_status_bar()
 
         self.function_map = {
             "Flip Profile": (ProfileFlipWindow, profile_flip),
             "Running Average": (RunningAverageWindow, running_average),
             "Median XY-Filter": (MedianXYFilterWindow, median_xy_filter),
+            "AGC": (AGCWindow, agc),
+            "Bandpass": (BandpassWindow, bandpass),
         }
 
     def create_menu(self):
@@ -117,11 +129,11 @@ class App(QMainWindow):
         file_menu.addAction("Open SEG-Y", self.open_file_dialog)
         file_menu.addAction("Close SEG-Y file", self.drop_file)
 
-        # edit_menu = QMenu("Edit", self)
-        # menubar.addMenu(edit_menu)
-        #
-        # edit_menu.addAction("Preferences")
-        # edit_menu.addAction("Clear Canvas")
+        edit_menu = QMenu("Edit", self)
+        menubar.addMenu(edit_menu)
+
+        edit_menu.addAction("Undo", QKeySequence.StandardKey.Undo, self.undo)
+        edit_menu.addAction("Redo", QKeySequence.StandardKey.Redo, self.redo)
 
         data_menu = QMenu("Data", self)
         menubar.addMenu(data_menu)
@@ -135,15 +147,30 @@ class App(QMainWindow):
         path = QFileDialog.getOpenFileName(self, 'Open file', home_dir, filter="SEG-Y files (*.seg *.segy)")[0]
 
         if path:
-            self.segy_file = SegyFile(path)
-            self.metadata = self.segy_file.get_metadata()
-            self.populate_data_table(self.metadata)
-            self.sample_interval = float(self.metadata.get("Sample Interval"))
+            # Loads and filters still running belong to the previous file, their section is dropped with it
+            self.drop_file()
+            self.status_label.setText(f"Opening {Path(path).name}...")
+
+            # Subsampled statistics are enough for a display clip and stay fast on large files
+            self.jobs.submit(
+                "file", open_segy_job, path, STATISTICS_TRACES,
+                on_result=self.file_opened,
+                on_error=self.job_failed,
+            )
+
+    def file_opened(self, result):
+        self.segy_file, self.metadata, self.clip = result
+        self.populate_data_table(self.metadata)
+        self.sample_interval = float(self.metadata.get("Sample Interval"))
+        self.status_label.setText("File opened")
 
     def drop_file(self):
+        self.jobs.cancel_all()
         self.segy_file = None
         self.metadata = None
         self.trace_data = None
+        self.clip = None
+        self.history = None
 
         placeholder_data = [
             ("Samples Per Trace", "—"),
@@ -194,6 +221,7 @@ class App(QMainWindow):
                 self.trace_data = self.segy_file.get_trace(value)
                 self.trace_data_shape = np.shape(self.trace_data)
                 self.trace_data_range = None
+                self.history = None
                 self.canvas.plot_trace(self.sample_interval, self.trace_data)
             except Exception as e:
                 self.show_error(str(e))
@@ -239,14 +267,26 @@ class App(QMainWindow):
                 if end - start > 1500:
                     self.show_warning("Due to memory limitations, a user can request up to 1500 traces!")
                     return
-
-                # Transpose data for better visualisation
-                self.trace_data = self.segy_file.get_trace_range(start, end).T
-                self.trace_data_shape = np.shape(self.trace_data)
-                self.trace_data_range = (start, end)
-                self.canvas.plot_section(self.sample_interval, start, self.trace_data)
             except Exception as e:
                 self.show_error(str(e))
+                return
+
+            # Submitting replaces the range that is still loading, if any
+            self.status_label.setText(f"Loading traces {start}-{end}...")
+            self.jobs.submit(
+                "load", load_range_job, self.segy_file, start, end, self.sample_interval,
+                on_result=lambda history: self.range_loaded(history, start, end),
+                on_error=self.job_failed,
+                on_progress=self.show_progress,
+            )
+
+    def range_loaded(self, history, start, end):
+        self.history = history
+        self.trace_data = history.data
+        self.trace_data_shape = np.shape(self.trace_data)
+        self.trace_data_range = (start, end)
+        self.status_label.setText(f"Loaded traces {start}-{end}")
+        self.canvas.plot_section(self.sample_interval, start, self.trace_data, clip=self.clip)
 
     def populate_data_table(self, metadata):
         rows = self.data_table.rowCount()
@@ -316,7 +356,7 @@ class App(QMainWindow):
     def create_functions_table(self):
         table = QTableWidget()
         table.setColumnCount(1)
-        table.setRowCount(3)
+        table.setRowCount(5)
 
         table.setHorizontalHeaderLabels(["Functions"])
 
@@ -324,6 +364,8 @@ class App(QMainWindow):
             "Flip Profile",
             "Running Average",
             "Median XY-Filter",
+            "AGC",
+            "Bandpass",
         ]
 
         for row, name in enumerate(functions):
@@ -342,8 +384,13 @@ class App(QMainWindow):
         return table
 
     def open_function_window(self, row):
-        if self.trace_data is None:
-            self.show_warning("Load or request data before applying functions.")
+        if self.history is None:
+            self.show_warning("Load or request a trace range before applying functions.")
+            return
+
+        # History is modified in place by the running filter
+        if self.jobs.is_busy("filter"):
+            self.show_warning("Wait for the running function to finish.")
             return
 
         item = self.functions_table.item(row, 0)
@@ -356,13 +403,98 @@ class App(QMainWindow):
 
         if dialog.exec():
             params = dialog.get_params()
+            history = self.history
+
+            self.status_label.setText(f"Applying {name}...")
+            self.jobs.submit(
+                "filter", transform_job, history, transformation, params,
+                on_result=lambda data: self.status_label.setText(f"Applied {name}"),
+                on_error=lambda message: self.job_failed(
+                    "Encountered error while transforming data, processed has not finished,"
+                    f" data remained unchanged. Error message: \n {message}"
+                ),
+                on_progress=self.show_progress,
+                on_finished=lambda: self.history_changed(history),
+            )
+
+    def history_changed(self, history):
+        # Called whenever a filter, undo or redo job stops, as a cancel that came too late to stop it still leaves the step applied
+        if history is not self.history:
+            # A different range was loaded while the function was running
+            return
 
-            try:
-                self.trace_data = transformation(params, self.trace_data, self.sample_interval)
-                self.canvas.plot_section(self.sample_interval, self.trace_data_range[0], self.trace_data)
-            except Exception as e:
-                self.show_error("Encountered error while transforming data, processed has not finished,"
-                                f" data remained unchanged. Error message: \n {e}")
+        self.trace_data = history.data
+        self.replot_section()
+
+    def undo(self):
+        if self.history is None or not self.history.can_undo or self.jobs.is_busy("filter"):
+            return
+
+        self.step_history(undo_job)
+
+    def redo(self):
+        if self.history is None or not self.history.can_redo or self.jobs.is_busy("filter"):
+            return
+
+        self.step_history(redo_job)
+
+    def step_history(self, job):
+        # A step whose band was dropped is recomputed by re-reading the range and replaying the earlier
+        # filters, so undo and redo share the "filter" slot and run off the GUI thread
+        history = self.history
+        self.jobs.submit(
+            "filter", job, history,
+            on_error=self.job_failed,
+            on_finished=lambda: self.history_changed(history),
+        )
+
+    def replot_section(self):
+        # Raw sections use the whole-file clip, processed ones are clipped by their own amplitudes
+        clip = self.clip if not self.history.can_undo else None
+        self.canvas.plot_section(self.sample_interval, self.trace_data_range[0], self.trace_data, clip=clip)
+
+    def create_status_bar(self):
+        status_bar = self.statusBar()
+
+        self.status_label = QLabel("Ready")
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setMaximumWidth(200)
+        self.progress_bar.setVisible(False)
+        self.cancel_button = QPushButton("Cancel")
+        self.cancel_button.setVisible(False)
+        self.cancel_button.clicked.connect(self.cancel_jobs)
+        self.frame_label = QLabel()
+
+        status_bar.addWidget(self.status_label, stretch=1)
+        status_bar.addPermanentWidget(self.progress_bar)
+        status_bar.addPermanentWidget(self.cancel_button)
+        status_bar.addPermanentWidget(self.frame_label)
+
+        self.jobs.busy_changed.connect(self.update_busy_state)
+        self.canvas.frame_rendered.connect(
+            lambda seconds: self.frame_label.setText(f"Frame: {seconds * 1000:.0f} ms")
+        )
+
+    def update_busy_state(self, kind, busy):
+        busy = self.jobs.is_busy()
+        self.cancel_button.setVisible(busy)
+
+        if busy:
+            # Jobs without progress reports show a busy indicator
+            self.progress_bar.setRange(0, 0)
+        self.progress_bar.setVisible(busy)
+
+    def show_progress(self, done, total):
+        self.progress_bar.setRange(0, total)
+        self.progress_bar.setValue(done)
+
+    def cancel_jobs(self):
+        self.jobs.cancel_all()
+        self.status_label.setText("Cancelled")
+
+    def job_failed(self, message):
+        self.status_label.setText("Failed")
+        self.show_error(message)
 
     def get_text_header(self):
         if self.segy_file is None:
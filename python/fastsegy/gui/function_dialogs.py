@@ -154,3 +154,93 @@ class MedianXYFilterWindow(QDialog):
             "start_time": self.start_edit.text(),
             "end_time": self.end_edit.text()
         }
+
+
+class AGCWindow(QDialog):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Automatic Gain Control")
+        self.setMinimumSize(300, 180)
+
+        layout = QVBoxLayout(self)
+        self.window_edit = QLineEdit()
+
+        desc = QLabel(
+            "Applies automatic gain control (AGC) to every trace.\n\n"
+            "Each sample is divided by the RMS amplitude of a sliding time window centered on it, "
+            "which balances weak late arrivals against strong shallow reflections.\n\n"
+            "Parameters:\n"
+            "• Window — Length of the AGC window in seconds"
+        )
+        desc.setWordWrap(True)
+        desc.setAlignment(Qt.AlignmentFlag.AlignTop)
+        layout.addWidget(desc)
+
+        layout.addWidget(QLabel("Window [s]"))
+        layout.addWidget(self.window_edit)
+
+        buttons = QDialogButtonBox(
+            QDialogButtonBox.StandardButton.Ok |
+            QDialogButtonBox.StandardButton.Cancel
+        )
+
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+
+        layout.addWidget(buttons)
+
+    def get_params(self):
+        return {
+            "window": self.window_edit.text()
+        }
+
+
+class BandpassWindow(QDialog):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Bandpass Filter")
+        self.setMinimumSize(300, 220)
+
+        layout = QVBoxLayout(self)
+        self.low_edit = QLineEdit()
+        self.high_edit = QLineEdit()
+        self.taper_edit = QLineEdit()
+
+        desc = QLabel(
+            "Applies a zero-phase frequency bandpass filter to every trace.\n\n"
+            "Frequencies outside of the selected band are removed without shifting the phase "
+            "of the remaining signal.\n\n"
+            "Parameters:\n"
+            "• Low Cut — Lower corner frequency in Hz\n"
+            "• High Cut — Upper corner frequency in Hz\n"
+            "• Taper — Width of the cosine ramps outside of the corners in Hz - if left empty, 5 Hz is used"
+        )
+        desc.setWordWrap(True)
+        desc.setAlignment(Qt.AlignmentFlag.AlignTop)
+        layout.addWidget(desc)
+
+        layout.addWidget(QLabel("Low Cut [Hz]"))
+        layout.addWidget(self.low_edit)
+
+        layout.addWidget(QLabel("High Cut [Hz]"))
+        layout.addWidget(self.high_edit)
+
+        layout.addWidget(QLabel("Taper [Hz]"))
+        layout.addWidget(self.taper_edit)
+
+        buttons = QDialogButtonBox(
+            QDialogButtonBox.StandardButton.Ok |
+            QDialogButtonBox.StandardButton.Cancel
+        )
+
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+
+        layout.addWidget(buttons)
+
+    def get_params(self):
+        return {
+            "low": self.low_edit.text(),
+            "high": self.high_edit.text(),
+            "taper": self.taper_edit.text()
+        }
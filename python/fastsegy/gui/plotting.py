@@ -1,5 +1,8 @@
+import time
+
 import matplotlib
 import numpy as np
+from PyQt6.QtCore import pyqtSignal
 from PyQt6.QtWidgets import QWidget, QVBoxLayout
 from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg
 from mpl_toolkits.axes_grid1 import make_axes_locatable
@@ -7,6 +10,9 @@ from matplotlib.figure import Figure
 matplotlib.use("QtAgg")
 
 class PlotCanvas(QWidget):
+    # Seconds from a plot request to the finished draw
+    frame_rendered = pyqtSignal(float)
+
     def __init__(self, parent=None):
         super().__init__(parent)
 
@@ -24,13 +30,19 @@ class PlotCanvas(QWidget):
         self.ax.set_ylabel("Amplitude")
 
         self._line = None
+        self._image = None
+        self._background = None
+        self._frame_start = None
         self.cbar = None
         self.cmap = "seismic"
+        self.last_frame_time = None
+
+        self.canvas.mpl_connect("draw_event", self._on_draw)
+        self.canvas.mpl_connect("resize_event", self._on_resize)
 
     def plot_trace(self, sample_interval: float, trace: np.ndarray):
-        if self.cbar:
-            self.cbar.remove()
-            self.cbar = None
+        self._frame_start = time.perf_counter()
+        self._reset_section()
 
         # sample_interval [us] -> [s]
         sample_interval = sample_interval / 1e6
@@ -45,29 +57,64 @@ class PlotCanvas(QWidget):
         self.ax.grid(True, alpha=0.3)
         self.canvas.draw_idle()
 
-    def plot_section(self, sample_interval: float, start_trace_index: int, data: np.ndarray):
-        if self.cbar:
-            self.cbar.remove()
-
-        self.ax.clear()
+    def plot_section(self, sample_interval: float, start_trace_index: int, data: np.ndarray, clip=None):
+        self._frame_start = time.perf_counter()
 
         n_samples = data.shape[0]
         n_traces = data.shape[1]
         total_time = n_samples * sample_interval / 1e6
         x_start = start_trace_index
         x_end = start_trace_index + n_traces
+        extent = (x_start, x_end, total_time, 0)
+
+        # Matplotlib resamples the image to screen size anyway, handing it more pixels only costs time.
+        # The view never shares memory with data, which processing jobs modify in place.
+        view = self._downsample(data)
 
-        vmax = np.percentile(np.abs(data), 98)
+        # A clip taken from whole-file statistics keeps colors comparable between trace ranges
+        vmax = clip if clip else np.percentile(np.abs(view), 98)
         vmin = -vmax
 
+        if self._image is None:
+            self._create_section(view, vmin, vmax, extent)
+        elif self._background is not None and self._image.get_extent() == list(extent):
+            # Axes and ticks are unchanged. The image and colorbar are not part of the cached background,
+            # so they are redrawn over it and blitted, also when a filter changed the color limits.
+            self._image.set_data(view)
+            self._image.set_clim(vmin, vmax)
+            self.canvas.restore_region(self._background)
+            self._draw_section()
+            self.canvas.blit(self.figure.bbox)
+            self._report_frame()
+            return
+        else:
+            # Only pixel data and limits change, the image artist and colorbar are reused
+            self._image.set_data(view)
+            self._image.set_extent(extent)
+            self._image.set_clim(vmin, vmax)
+            self.ax.set_xlim(x_start, x_end)
+            self.ax.set_ylim(total_time, 0)
+
+        self.canvas.draw_idle()
+
+    def clear_plot(self):
+        self._reset_section()
+        self.ax.clear()
+        self.canvas.draw_idle()
+
+    def _create_section(self, view, vmin, vmax, extent):
+        self.ax.clear()
+
         self._image = self.ax.imshow(
-            data,
+            view,
             aspect="auto",
             cmap=self.cmap,
             vmin=vmin,
             vmax=vmax,
             origin="upper",
-            extent=(x_start, x_end, total_time, 0)
+            interpolation="antialiased",
+            extent=extent,
+            animated=True
         )
 
         self.ax.set_title("Seismic Section")
@@ -79,12 +126,60 @@ class PlotCanvas(QWidget):
 
         self.cbar = self.figure.colorbar(self._image, cax=cax)
         self.cbar.set_label("Amplitude [-]", loc="center")
-        self.canvas.draw_idle()
 
-    def clear_plot(self):
+        # Animated artists are left out of full draws, _on_draw paints them over the cached background
+        cax.set_animated(True)
+
+    def _reset_section(self):
         if self.cbar:
             self.cbar.remove()
             self.cbar = None
 
-        self.ax.clear()
-        self.canvas.draw_idle()
+        self._image = None
+        self._background = None
+
+    def _downsample(self, data):
+        # Block means with at least one value per screen pixel in each direction. Averaging before
+        # decimating keeps detail finer than a pixel from aliasing into the image.
+        bbox = self.ax.get_window_extent()
+        sample_step = max(1, data.shape[0] // max(int(bbox.height), 1))
+        trace_step = max(1, data.shape[1] // max(int(bbox.width), 1))
+
+        view = data
+        for axis, step in ((0, sample_step), (1, trace_step)):
+            if step == 1:
+                continue
+
+            starts = np.arange(0, view.shape[axis], step)
+            counts = np.diff(np.append(starts, view.shape[axis])).astype(np.float32)
+            view = np.add.reduceat(view, starts, axis=axis, dtype=np.float32) / np.expand_dims(counts, 1 - axis)
+
+        # Nothing reduced - the section already fits the screen and is cheap to copy
+        if view is data:
+            view = np.array(data, dtype=np.float32)
+
+        return view
+
+    def _draw_section(self):
+        self.ax.draw_artist(self._image)
+        self.figure.draw_artist(self.cbar.ax)
+
+    def _on_draw(self, event):
+        if self._image is not None:
+            self._background = self.canvas.copy_from_bbox(self.figure.bbox)
+            self._draw_section()
+
+        self._report_frame()
+
+    def _report_frame(self):
+        if self._frame_start is None:
+            return
+
+        self.last_frame_time = time.perf_counter() - self._frame_start
+        self._frame_start = None
+        self.frame_rendered.emit(self.last_frame_time)
+
+    def _on_resize(self, event):
+        # The cached background has the old size. The canvas redraws the current image itself and the
+        # next plot_section builds a view for the new size.
+        self._background = None
@@ -0,0 +1,192 @@
+import threading
+import numpy as np
+
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+from fastsegy import SegyFile
+from fastsegy.history import ProcessingHistory
+
+
+class JobCancelled(Exception):
+    pass
+
+
+class JobSignals(QObject):
+    progress = pyqtSignal(int, int)
+    result = pyqtSignal(object)
+    error = pyqtSignal(str)
+    finished = pyqtSignal()
+
+
+class Job(QRunnable):
+    """
+    Runs func(job, *args) on a pool thread. func reports progress with job.report_progress and
+    should call job.check_cancelled between steps, a cancelled job never emits its result.
+    """
+
+    def __init__(self, func, *args):
+        super().__init__()
+        self.func = func
+        self.args = args
+        self.signals = JobSignals()
+        self._cancelled = threading.Event()
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    def cancel(self):
+        self._cancelled.set()
+
+    def check_cancelled(self):
+        if self.cancelled:
+            raise JobCancelled()
+
+    def report_progress(self, done, total):
+        self.check_cancelled()
+        self.signals.progress.emit(done, total)
+
+    def run(self):
+        try:
+            result = self.func(self, *self.args)
+        except JobCancelled:
+            pass
+        except Exception as e:
+            if not self.cancelled:
+                self.signals.error.emit(str(e))
+        else:
+            if not self.cancelled:
+                self.signals.result.emit(result)
+        finally:
+            self.signals.finished.emit()
+
+
+class JobManager(QObject):
+    """
+    Runs jobs on a thread pool with one slot per kind of job ("file", "load", "filter").
+    Submitting a job cancels the in-flight job of the same kind, and results of replaced jobs
+    are dropped even if they were already on their way to the main thread.
+
+    A kind stays busy until all of its jobs have stopped, cancelled ones included - a cancelled
+    filter may still be writing to its section until it reaches its next check.
+    """
+
+    busy_changed = pyqtSignal(str, bool)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.pool = QThreadPool(self)
+        # Job of each kind whose result is still wanted
+        self.active = {}
+        # Jobs of each kind that have not finished yet
+        self.running = {}
+
+    def submit(self, kind, func, *args, on_result=None, on_error=None, on_progress=None, on_finished=None):
+        """
+        on_finished is called once the job has stopped, even if it failed, was cancelled or replaced.
+        """
+
+        self.cancel(kind)
+
+        job = Job(func, *args)
+        self.active[kind] = job
+        was_busy = self.is_busy(kind)
+        self.running.setdefault(kind, set()).add(job)
+
+        # Slots are connected from the main thread, so signals emitted by the pool thread are queued to it
+        if on_result is not None:
+            job.signals.result.connect(lambda result: self.is_current(kind, job) and on_result(result))
+        if on_error is not None:
+            job.signals.error.connect(lambda message: self.is_current(kind, job) and on_error(message))
+        if on_progress is not None:
+            job.signals.progress.connect(lambda done, total: self.is_current(kind, job) and on_progress(done, total))
+        job.signals.finished.connect(lambda: self.job_finished(kind, job))
+        if on_finished is not None:
+            job.signals.finished.connect(on_finished)
+
+        if not was_busy:
+            self.busy_changed.emit(kind, True)
+        self.pool.start(job)
+
+        return job
+
+    def is_current(self, kind, job):
+        return self.active.get(kind) is job
+
+    def is_busy(self, kind=None):
+        if kind is None:
+            return any(self.running.values())
+
+        return bool(self.running.get(kind))
+
+    def cancel(self, kind):
+        # The job's result is dropped now, the kind stays busy until the job stops
+        job = self.active.pop(kind, None)
+        if job is not None:
+            job.cancel()
+
+    def cancel_all(self):
+        for kind in list(self.active):
+            self.cancel(kind)
+
+    def job_finished(self, kind, job):
+        if self.active.get(kind) is job:
+            del self.active[kind]
+
+        self.running[kind].discard(job)
+        if not self.running[kind]:
+            self.busy_changed.emit(kind, False)
+
+
+def open_segy_job(job, path, statistics_traces):
+    job.report_progress(0, 2)
+    segy_file = SegyFile(path)
+    metadata = segy_file.get_metadata()
+
+    job.report_progress(1, 2)
+    segy_file.compute_statistics(max_traces=statistics_traces)
+    clip = segy_file.amplitude_percentile(98)
+
+    return segy_file, metadata, clip
+
+
+def load_range_job(job, segy_file, start, end, sample_interval, chunk_traces=100):
+    if start >= end:
+        raise ValueError("Starting trace must be lower than ending trace")
+
+    total = end - start + 1
+    chunks = []
+
+    # Reading in chunks lets the job report progress and stop early when cancelled
+    for chunk_start in range(start, end + 1, chunk_traces):
+        chunk_end = min(chunk_start + chunk_traces - 1, end)
+
+        if chunk_start == chunk_end:
+            chunks.append(segy_file.get_trace(chunk_start)[None, :])
+        else:
+            chunks.append(segy_file.get_trace_range(chunk_start, chunk_end))
+
+        job.report_progress(chunk_end - start + 1, total)
+
+    # Transpose data for better visualisation
+    return ProcessingHistory(
+        np.concatenate(chunks).T,
+        sample_interval,
+        reload=lambda: segy_file.get_trace_range(start, end).T,
+    )
+
+
+def transform_job(job, history, transformation, params):
+    job.check_cancelled()
+
+    # A cancel stops the filter at its next progress report and the history restores the section
+    return history.apply(transformation, params, progress=job.report_progress)
+
+
+def undo_job(job, history):
+    # Undo and redo are not interrupted, a replay stopped halfway would leave the section between two steps
+    return history.undo()
+
+
+def redo_job(job, history):
+    return history.redo()
@@ -0,0 +1,147 @@
+import numpy as np
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from fastsegy.processing import sample_window
+
+# Default memory budget for stored sample bands
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+@dataclass
+class Step:
+    func: Callable
+    params: dict
+    rows: slice
+    # Sample band of the section before the step (while undoable) or after it (while redoable).
+    # None once dropped to stay within the memory budget - the band is then recomputed.
+    band: Optional[np.ndarray]
+
+
+class ProcessingHistory:
+    """
+    Undo/redo history of transforms applied in place to one section.
+
+    Every step keeps only the band of samples (start_time..end_time rows) it changed. Undo swaps
+    the stored band with the section, so undo and redo are copies of a single band. When the bands
+    exceed max_bytes, the oldest ones are dropped and those steps are recomputed by replaying
+    the history from the original section instead.
+
+    data: np.ndarray [samples, traces], converted to float32 if it is not a floating point array
+    reload: callable returning the original section again (e.g. re-reading it from the file),
+            if not given a copy of the original section is kept as the checkpoint
+    """
+
+    def __init__(self, data, sample_interval, reload=None, max_bytes=DEFAULT_MAX_BYTES):
+        if not np.issubdtype(data.dtype, np.floating):
+            data = data.astype(np.float32)
+
+        self.data = data
+        self.sample_interval = sample_interval
+        self.max_bytes = max_bytes
+        self.reload = reload
+        self.checkpoint = None if reload is not None else data.copy()
+        self.undo_steps = []
+        self.redo_steps = []
+
+    @property
+    def can_undo(self):
+        return bool(self.undo_steps)
+
+    @property
+    def can_redo(self):
+        return bool(self.redo_steps)
+
+    @property
+    def stored_bytes(self):
+        return sum(step.band.nbytes for step in self.undo_steps + self.redo_steps if step.band is not None)
+
+    def apply(self, func, params, progress=None):
+        """
+        Applies func(params, data, sample_interval, out=data) in place and records it.
+        progress is handed to func when given, an exception raised by it stops func.
+        If func fails or is stopped, the section is left unchanged.
+        """
+
+        rows = self.changed_rows(params)
+        band = self.data[rows].copy()
+        kwargs = {} if progress is None else {"progress": progress}
+
+        try:
+            func(params, self.data, self.sample_interval, out=self.data, **kwargs)
+        except Exception:
+            self.data[rows] = band
+            raise
+
+        self.undo_steps.append(Step(func, params, rows, band))
+        self.redo_steps.clear()
+        self.enforce_budget()
+
+        return self.data
+
+    def undo(self):
+        if not self.undo_steps:
+            return self.data
+
+        step = self.undo_steps.pop()
+        after = self.data[step.rows].copy()
+
+        if step.band is not None:
+            self.data[step.rows] = step.band
+        else:
+            self.replay()
+
+        step.band = after
+        self.redo_steps.append(step)
+        self.enforce_budget()
+
+        return self.data
+
+    def redo(self):
+        if not self.redo_steps:
+            return self.data
+
+        step = self.redo_steps.pop()
+        before = self.data[step.rows].copy()
+
+        if step.band is not None:
+            self.data[step.rows] = step.band
+        else:
+            step.func(step.params, self.data, self.sample_interval, out=self.data)
+
+        step.band = before
+        self.undo_steps.append(step)
+        self.enforce_budget()
+
+        return self.data
+
+    def changed_rows(self, params):
+        # Transforms without a time window (flips, AGC, bandpass) change the whole section
+        if "start_time" not in params and "end_time" not in params:
+            return slice(None)
+
+        start, end = sample_window(params, self.data.shape[0], self.sample_interval)
+
+        return slice(max(start, 0), end + 1)
+
+    def replay(self):
+        """Restores the original section and reapplies all undoable steps."""
+
+        original = self.reload() if self.reload is not None else self.checkpoint
+        self.data[...] = original
+
+        for step in self.undo_steps:
+            step.func(step.params, self.data, self.sample_interval, out=self.data)
+
+    def enforce_budget(self):
+        # Oldest undo bands go first, then the redo bands furthest from the current state
+        candidates = self.undo_steps + self.redo_steps
+        stored = self.stored_bytes
+
+        for step in candidates:
+            if stored <= self.max_bytes:
+                break
+
+            if step.band is not None:
+                stored -= step.band.nbytes
+                step.band = None
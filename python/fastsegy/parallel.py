@@ -0,0 +1,66 @@
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+# SegyFile of the current worker process, set once by init_worker
+worker_file = None
+
+
+def init_worker(segy_file):
+    # segy_file arrives pickled as its path and trace index, so this only remaps the file
+    global worker_file
+    worker_file = segy_file
+
+
+def run_chunk(func, start, end):
+    if start == end:
+        data = worker_file.get_trace(start)[None, :]
+    else:
+        data = worker_file.get_trace_range(start, end)
+
+    return func(data)
+
+
+def map_chunks(segy_file, func, chunk_traces=1000, workers=None):
+    """
+    Applies func to consecutive chunks of traces in worker processes and yields the results in file order.
+
+    segy_file: SegyFile, sent to every worker once, without any trace data
+    func: picklable (module level) callable taking np.ndarray [traces, samples]
+    chunk_traces: int - number of traces per chunk
+    workers: int - number of worker processes, defaults to the number of CPUs
+    """
+
+    chunk_traces = int(chunk_traces)
+    if chunk_traces <= 0:
+        raise ValueError("chunk_traces must be > 0")
+
+    if workers is not None and workers <= 0:
+        raise ValueError("workers must be > 0")
+    workers = workers or os.cpu_count() or 1
+
+    return _map_chunks(segy_file, func, chunk_traces, workers)
+
+
+def _map_chunks(segy_file, func, chunk_traces, workers):
+    trace_count = segy_file.trace_count
+    bounds = (
+        (start, min(start + chunk_traces - 1, trace_count))
+        for start in range(1, trace_count + 1, chunk_traces)
+    )
+
+    pool = ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(segy_file,))
+    pending = deque()
+
+    try:
+        # At most two chunks per worker are in flight, so results never pile up in memory
+        for start, end in bounds:
+            pending.append(pool.submit(run_chunk, func, start, end))
+
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        pool.shutdown(cancel_futures=True)
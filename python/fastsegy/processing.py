@@ -1,23 +1,44 @@
 import numpy as np
 import math
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from scipy import fft
 from scipy.ndimage import median_filter
 
+# Blocks smaller than this are not worth a thread of their own
+MIN_BLOCK_TRACES = 64
 
-def profile_flip(params: dict, data: np.ndarray):
+# Blocks per worker when progress is reported, so it advances in steps and a cancel lands quickly
+PROGRESS_BLOCKS_PER_WORKER = 4
+
+# Traces per median filter call, the filter reports progress between calls
+MEDIAN_BLOCK_TRACES = 256
+
+
+def profile_flip(params: dict, data: np.ndarray, sample_interval=None, out=None, progress=None):
     axis = params["axis"]
 
-    if axis == "x":
-        return np.fliplr(data)
-    else:
-        return np.flipud(data)
+    flipped = np.fliplr(data) if axis == "x" else np.flipud(data)
 
+    if out is None:
+        return flipped
+
+    # Assignment copes with out being data itself, numpy buffers overlapping views
+    check_out(data, out)
+    out[...] = flipped
+
+    return out
 
-def running_average(params: dict, data: np.ndarray, sample_interval):
+
+def running_average(params: dict, data: np.ndarray, sample_interval, out=None, progress=None):
     """
     Horizontal running average filter across traces.
 
     params: dict (average_traces, start_sample, end_sample)
     data: np.ndarray [traces, samples]
+    out: np.ndarray, optional array of data's shape the result is written into, may be data itself
+    progress: callable(done, total), optional, called after every filtered row, an exception raised by it stops the filter
     """
 
     average_traces = int(params.get('range'))
@@ -25,35 +46,20 @@ def running_average(params: dict, data: np.ndarray, sample_interval):
         raise ValueError("average_traces must be in range 1..1024")
 
     samples, traces = data.shape
-
-    start_time = params.get("start_time")
-    end_time = params.get("end_time")
-
-    if start_time is None or start_time == "":
-        start_sample = 0
-    else:
-        start_sample = time_to_sample_index(
-            float(start_time),
-            sample_interval,
-        )
-
-    if end_time is None or end_time == "":
-        end_sample = samples - 1
-    else:
-        end_sample = time_to_sample_index(
-            float(end_time),
-            sample_interval,
-        )
+    start_sample, end_sample = sample_window(params, samples, sample_interval)
 
     if start_sample < 0 or end_sample >= samples * sample_interval:
         raise ValueError("Sample range out of bounds")
 
-    output = data.copy()
+    output = prepare_out(data, out)
 
     for t in range(start_sample, end_sample+1):
         row = data[t, :]
         output[t, :] = horizontal_running_mean(row, average_traces)
 
+        if progress is not None:
+            progress(t - start_sample + 1, end_sample - start_sample + 1)
+
     return output
 
 
@@ -70,12 +76,14 @@ def horizontal_running_mean(row, window):
     return out
 
 
-def median_xy_filter(params: dict, data: np.ndarray, sample_interval):
+def median_xy_filter(params: dict, data: np.ndarray, sample_interval, out=None, progress=None):
     """
     Filters data by median.
 
     params: dict (x, y, start_time, end_time) x, y - size of the filter window, start_time, end_time - range of filtered samples
     data: np.ndarray [traces, samples]
+    out: np.ndarray, optional array of data's shape the result is written into, may be data itself
+    progress: callable(done, total), optional, called after every block of traces, an exception raised by it stops the filter
     """
 
     x_window = int(params["x"])
@@ -88,6 +96,204 @@ def median_xy_filter(params: dict, data: np.ndarray, sample_interval):
         raise ValueError("y must be > 0")
 
     samples, traces = data.shape
+    start, end = sample_window(params, samples, sample_interval)
+
+    # Only the filtered rows plus half a window above and below them are needed
+    half = y_window // 2
+    lo = max(0, start - half)
+    hi = min(samples, end + 1 + half)
+
+    if start > end or start >= samples:
+        return prepare_out(data, out)
+
+    rows = slice(start - lo, end + 1 - lo)
+    filtered = np.empty_like(data[lo:hi][rows])
+
+    # Blocks of traces with half a window of neighbours on both sides give the same medians as one call.
+    # Results are only written to out at the end, as out may be data itself.
+    firsts = range(0, traces, MEDIAN_BLOCK_TRACES)
+    for done, first in enumerate(firsts, 1):
+        last = min(first + MEDIAN_BLOCK_TRACES, traces)
+        left = max(0, first - x_window // 2)
+        right = min(traces, last + x_window // 2)
+
+        block = median_filter(
+            data[lo:hi, left:right],
+            size=(y_window, x_window),
+            mode="nearest"
+        )
+        filtered[:, first:last] = block[rows, first-left:last-left]
+
+        if progress is not None:
+            progress(done, len(firsts))
+
+    out = prepare_out(data, out)
+    out[start:end+1] = filtered
+
+    return out
+
+
+def agc(params: dict, data: np.ndarray, sample_interval, workers=None, out=None, progress=None):
+    """
+    Automatic gain control, divides every sample by the RMS amplitude of a sliding time window.
+
+    params: dict (window) window - length of the AGC window in seconds
+    data: np.ndarray [samples, traces], a whole section or a streamed chunk of traces
+    out: np.ndarray, optional floating point array of data's shape the result is written into, may be data itself
+    progress: callable(done, total), optional, called after every block of traces, an exception raised by it stops the filter
+    """
+
+    window = params.get("window")
+    if window is None or window == "":
+        raise ValueError("window must be provided")
+
+    samples, traces = data.shape
+    window_samples = time_to_sample_index(float(window), sample_interval)
+
+    if window_samples <= 0 or window_samples > samples:
+        raise ValueError(f"window must be in range 1..{samples} samples")
+
+    if out is None:
+        out = np.empty(data.shape, dtype=float_dtype(data))
+    else:
+        check_out(data, out, floating=True)
+
+    process_trace_blocks(agc_block, data, out, window_samples, workers=workers, progress=progress)
+
+    return out
+
+
+def agc_block(data, out, window):
+    samples = data.shape[0]
+    half = window // 2
+
+    energy = np.zeros((samples + 1, data.shape[1]))
+    np.cumsum(np.square(data, dtype=np.float64), axis=0, out=energy[1:])
+
+    idx = np.arange(samples)
+    left = np.maximum(idx - half, 0)
+    right = np.minimum(idx + half + 1, samples)
+
+    rms = np.sqrt((energy[right] - energy[left]) / (right - left)[:, None])
+    np.divide(data, rms, out=out, where=rms > 0)
+    out[rms == 0] = 0
+
+
+def bandpass(params: dict, data: np.ndarray, sample_interval, workers=None, out=None, progress=None):
+    """
+    Zero-phase frequency bandpass with cosine tapered edges.
+
+    params: dict (low, high, taper) low, high - corner frequencies in Hz, taper - width of the edge ramps in Hz
+    data: np.ndarray [samples, traces], a whole section or a streamed chunk of traces
+    out: np.ndarray, optional floating point array of data's shape the result is written into, may be data itself
+    progress: callable(done, total), optional, called after every block of traces, an exception raised by it stops the filter
+    """
+
+    low = float(params["low"])
+    high = float(params["high"])
+    taper = params.get("taper")
+    taper = 5.0 if taper is None or taper == "" else float(taper)
+
+    nyquist = 0.5 / (sample_interval / 1_000_000.0)
+    if low < 0 or high <= low or high > nyquist:
+        raise ValueError(f"Corner frequencies must satisfy 0 <= low < high <= {nyquist:g} Hz")
+
+    if taper < 0:
+        raise ValueError("taper must be >= 0")
+
+    samples = data.shape[0]
+
+    # Padding to twice the trace length keeps the circular convolution from wrapping around
+    n_fft = fft.next_fast_len(2 * samples, real=True)
+    response = bandpass_response(n_fft, sample_interval, low, high, taper)
+
+    if out is None:
+        out = np.empty(data.shape, dtype=float_dtype(data))
+    else:
+        check_out(data, out, floating=True)
+
+    process_trace_blocks(bandpass_block, data, out, n_fft, response, workers=workers, progress=progress)
+
+    return out
+
+
+def bandpass_block(data, out, n_fft, response):
+    # Each block is transformed on its own thread, so the transforms themselves run single-threaded
+    spectrum = fft.rfft(data, n=n_fft, axis=0, workers=1)
+    spectrum *= response
+    out[...] = fft.irfft(spectrum, n=n_fft, axis=0, workers=1)[:data.shape[0]]
+
+
+@lru_cache(maxsize=32)
+def bandpass_response(n_fft, sample_interval, low, high, taper):
+    """
+    Real (zero-phase) amplitude response of the bandpass filter, cached so streamed chunks of
+    the same length share one response.
+
+    Returns np.ndarray [n_fft // 2 + 1, 1]
+    """
+
+    freqs = fft.rfftfreq(n_fft, sample_interval / 1_000_000.0)
+    response = ((freqs >= low) & (freqs <= high)).astype(np.float64)
+
+    if taper > 0:
+        lower = (freqs >= low - taper) & (freqs < low)
+        response[lower] = 0.5 * (1 - np.cos(np.pi * (freqs[lower] - (low - taper)) / taper))
+
+        upper = (freqs > high) & (freqs <= high + taper)
+        response[upper] = 0.5 * (1 + np.cos(np.pi * (freqs[upper] - high) / taper))
+
+    response.flags.writeable = False
+
+    return response[:, None]
+
+
+def process_trace_blocks(func, data, out, *args, workers=None, progress=None):
+    """
+    Splits data into blocks of whole traces and runs func(block, out_block, *args) on each of them
+    in a thread pool. Numpy releases the GIL for the heavy lifting, so blocks run on separate cores.
+
+    data, out: np.ndarray [samples, traces]
+    progress: callable(done, total), optional, called as blocks finish in order. An exception raised by it
+              drops the blocks that have not started yet and is re-raised once the running ones finish.
+    """
+
+    traces = data.shape[1]
+    workers = workers or os.cpu_count() or 1
+    parts = workers if progress is None else workers * PROGRESS_BLOCKS_PER_WORKER
+    block = max(MIN_BLOCK_TRACES, math.ceil(traces / parts))
+    slices = [slice(i, min(i + block, traces)) for i in range(0, traces, block)]
+
+    if len(slices) <= 1:
+        func(data, out, *args)
+        if progress is not None:
+            progress(1, 1)
+        return out
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(func, data[:, s], out[:, s], *args) for s in slices]
+
+        try:
+            for done, future in enumerate(futures, 1):
+                future.result()
+                if progress is not None:
+                    progress(done, len(futures))
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            raise
+
+    return out
+
+
+def sample_window(params: dict, samples, sample_interval):
+    """
+    Returns the first and last (inclusive) sample index selected by params start_time and end_time,
+    a missing value selects the start or end of the trace.
+
+    params: dict (start_time, end_time) times in seconds
+    """
+
     start_time = params.get("start_time")
     end_time = params.get("end_time")
 
@@ -107,22 +313,36 @@ def median_xy_filter(params: dict, data: np.ndarray, sample_interval):
             sample_interval,
         )
 
-    out = data.copy()
+    return start, end
 
-    filtered = median_filter(
-        data,
-        size=(y_window, x_window),
-        mode="nearest"
-    )
 
-    if end is None:
-        out[start:] = filtered[start:]
-    else:
-        out[start:end+1] = filtered[start:end+1]
+def check_out(data, out, floating=False):
+    if out.shape != data.shape:
+        raise ValueError(f"out has shape {out.shape}, expected {data.shape}")
+
+    if floating and not np.issubdtype(out.dtype, np.floating):
+        raise ValueError("out must be a floating point array")
+
+
+def prepare_out(data, out):
+    """
+    Returns the array a windowed filter writes into: a copy of data, or out holding data's values.
+    """
+
+    if out is None:
+        return data.copy()
+
+    check_out(data, out)
+    if out is not data:
+        out[...] = data
 
     return out
 
 
+def float_dtype(data):
+    return np.float32 if data.dtype == np.float32 else np.float64
+
+
 def time_to_sample_index(time_sec, sample_interval_us):
     """
     Converts time in seconds to the first sample index at or after that time.
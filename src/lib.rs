@@ -1,19 +1,124 @@
+use std::collections::HashMap;
 use std::fmt::Display;
 use std::fs::File;
+use std::io::{BufRead, BufReader, BufWriter, Read, Write};
+use std::sync::mpsc::{sync_channel, Receiver};
+use flate2::read::MultiGzDecoder;
 use std::io::ErrorKind::{InvalidInput};
 use pyo3::prelude::*;
 use ebcdic::ebcdic::Ebcdic;
-use pyo3::exceptions::{PyIOError, PyTypeError};
-use pyo3::types::{PyString, PyDict};
+use pyo3::exceptions::{PyIOError, PyTypeError, PyValueError};
+use pyo3::types::{PyBytes, PyString, PyDict};
 use numpy::{IntoPyArray, PyArray2};
+use numpy::ndarray::Array2;
 use memmap2::{MmapOptions, Mmap};
+use rayon::prelude::*;
+use std::sync::Mutex;
+use std::sync::atomic::{AtomicU64, Ordering};
+#[cfg(unix)]
+use memmap2::{Advice, UncheckedAdvice};
+#[cfg(target_os = "linux")]
+use std::os::unix::io::AsRawFd;
 
 #[pymodule]
 fn _fastsegy(_py: Python, m: &Bound<'_, PyModule>) -> PyResult<()> {
     m.add_class::<SegyFile>()?;
+    m.add_class::<SegyStream>()?;
+    m.add_function(wrap_pyfunction!(_rebuild_segy_file, m)?)?;
+    m.add_function(wrap_pyfunction!(transcode, m)?)?;
+    m.add("TRACE_OK", TRACE_OK)?;
+    m.add("TRACE_TRUNCATED", TRACE_TRUNCATED)?;
+    m.add("TRACE_SAMPLE_COUNT", TRACE_SAMPLE_COUNT)?;
+    m.add("TRACE_NON_FINITE", TRACE_NON_FINITE)?;
+    m.add("TRACE_DENORMAL", TRACE_DENORMAL)?;
+    m.add("TRACE_IBM_EXPONENT", TRACE_IBM_EXPONENT)?;
     Ok(())
 }
 
+// Per-trace status flags reported by SegyFile.validate, a trace can have several of them set
+const TRACE_OK: u8 = 0;
+const TRACE_TRUNCATED: u8 = 1;          // trace runs past the end of the file
+const TRACE_SAMPLE_COUNT: u8 = 2;       // sample count is not positive or differs from the binary header
+const TRACE_NON_FINITE: u8 = 4;         // IEEE NaN or Inf samples
+const TRACE_DENORMAL: u8 = 8;           // IEEE denormal samples
+const TRACE_IBM_EXPONENT: u8 = 16;      // IBM samples that cannot be represented as a normal f32
+
+// Unpickling counterpart of SegyFile.__reduce__. Index blobs are read straight from the bytes
+// objects, the trace index alone is 8 bytes per trace.
+#[pyfunction]
+fn _rebuild_segy_file(
+    path: &str,
+    access: &str,
+    populate: bool,
+    trace_index: &[u8],
+    header_indexes: Vec<(String, Bound<'_, PyBytes>)>,
+) -> PyResult<SegyFile> {
+    let access = AccessPattern::parse(access)
+        .map_err(|e| PyValueError::new_err(e.to_string()))?;
+    let trace_index = trace_index
+        .chunks_exact(8)
+        .map(|b| u64::from_le_bytes([b[0], b[1], b[2], b[3], b[4], b[5], b[6], b[7]]))
+        .collect();
+
+    let segy = SegyFile::open_segy(path, access, populate, Some(trace_index))?;
+    {
+        let mut indexes = segy.header_indexes.lock().unwrap();
+        for (name, bytes) in header_indexes {
+            // Indexes built for a different version of the file are dropped and rebuilt on demand
+            if let Some(index) = HeaderIndex::from_bytes(bytes.as_bytes(), segy.index_stamp()) {
+                indexes.insert(name, index);
+            }
+        }
+    }
+
+    Ok(segy)
+}
+
+// Output bytes converted per parallel block by transcode, two blocks may wait for the writer thread
+const TRANSCODE_BLOCK_BYTES: usize = 64 * 1024 * 1024;
+
+/// Rewrites a whole SEG-Y file in another sample format and byte order.
+/// format is a SEG-Y data format code: 1 (IBM float) and 5 (IEEE float) accept any source format,
+/// 2, 3 and 8 (integers) only change the byte order of a file already in that format.
+/// byte_order is "big" or "little". Returns the number of traces written.
+#[pyfunction]
+#[pyo3(signature = (src, dst, format=5, byte_order="big"))]
+fn transcode(py: Python<'_>, src: &str, dst: &str, format: i16, byte_order: &str) -> PyResult<u64> {
+    let order = match byte_order {
+        "big" => ByteOrder::BigEndian,
+        "little" => ByteOrder::LittleEndian,
+        _ => return Err(PyValueError::new_err(
+            format!("Invalid byte order '{byte_order}'. Expected 'big' or 'little'")
+        )),
+    };
+    let target = DataFormat::from_code(format)
+        .ok()
+        .filter(|f| *f != DataFormat::FixedPointWGain)
+        .ok_or_else(|| PyValueError::new_err(format!("Unsupported target data format {format}")))?;
+
+    // The source stays memory mapped while dst is written, truncating it would invalidate the map
+    if let (Ok(a), Ok(b)) = (std::fs::canonicalize(src), std::fs::canonicalize(dst)) {
+        if a == b {
+            return Err(PyValueError::new_err("Cannot transcode a file onto itself"));
+        }
+    }
+
+    py.detach(|| {
+        let segy = SegyFile::open_segy(src, AccessPattern::Sequential, false, None)?;
+        let source = segy.b_header.data_format;
+
+        let float_target = matches!(target, DataFormat::IBMf32 | DataFormat::IEEf32);
+        if source == DataFormat::FixedPointWGain || (!float_target && source != target) {
+            return Err(PyValueError::new_err(format!("Cannot transcode {source:?} samples to {target:?}")));
+        }
+
+        segy.transcode_to(dst, target, order).map_err(|e| match e {
+            SegyError::Io(e) => PyIOError::new_err(e.to_string()),
+            e => PyTypeError::new_err(e.to_string()),
+        })
+    })
+}
+
 fn trace_to_numpy(py: Python, trace: TraceData) -> PyResult<Bound<PyAny>> {
     Ok(match trace {
         TraceData::F32(v) => v.into_pyarray(py).into_any(),
@@ -23,6 +128,109 @@ fn trace_to_numpy(py: Python, trace: TraceData) -> PyResult<Bound<PyAny>> {
     })
 }
 
+// Stacks traces into a 2D array [traces, samples]
+fn traces_to_numpy2(py: Python, traces: Vec<TraceData>) -> PyResult<Bound<PyAny>> {
+    if traces.is_empty() {
+        return Err(PyTypeError::new_err("Got empty array"));
+    }
+
+    match &traces[0] {
+        TraceData::F32(_) => {
+            let vec2: Vec<Vec<f32>> = traces
+                .into_iter()
+                .map(|t| if let TraceData::F32(v) = t { v } else { unreachable!() })
+                .collect();
+            let array = PyArray2::from_vec2(py, &vec2)
+                .map_err(|e| PyTypeError::new_err(format!("from_vec2 error: {:?}", e)))?;
+            Ok(array.into_any())
+        }
+        TraceData::I16(_) => {
+            let vec2: Vec<Vec<i16>> = traces
+                .into_iter()
+                .map(|t| if let TraceData::I16(v) = t { v } else { unreachable!() })
+                .collect();
+            let array = PyArray2::from_vec2(py, &vec2)
+                .map_err(|e| PyTypeError::new_err(format!("from_vec2 error: {:?}", e)))?;
+            Ok(array.into_any())
+        }
+        TraceData::I32(_) => {
+            let vec2: Vec<Vec<i32>> = traces
+                .into_iter()
+                .map(|t| if let TraceData::I32(v) = t { v } else { unreachable!() })
+                .collect();
+            let array = PyArray2::from_vec2(py, &vec2)
+                .map_err(|e| PyTypeError::new_err(format!("from_vec2 error: {:?}", e)))?;
+            Ok(array.into_any())
+        }
+        TraceData::I8(_) => {
+            let vec2: Vec<Vec<i8>> = traces
+                .into_iter()
+                .map(|t| if let TraceData::I8(v) = t { v } else { unreachable!() })
+                .collect();
+            let array = PyArray2::from_vec2(py, &vec2)
+                .map_err(|e| PyTypeError::new_err(format!("from_vec2 error: {:?}", e)))?;
+            Ok(array.into_any())
+        }
+    }
+}
+
+// Decodes the 3200 byte textual header into 80 character lines
+fn decode_text_header(data: &[u8]) -> PyResult<String> {
+    // In All Revision standards: textual header is 3200 bytes, padded with:
+    // - 0x40 (EBCDIC space) for EBCDIC encoding
+    // - 0x20 (ASCII space) for ASCII encoding
+    // This implementation checks last byte to determine encoding
+    // This should work every time, as it is extremely unlikely for a textual header to fill all 3200 bytes
+    let is_ebcdic = data[3199] == 0x40;
+    let mut ascii_buf = if is_ebcdic {
+        let mut result = vec![0u8; 3200];
+        Ebcdic::ebcdic_to_ascii(&data, &mut result, data.len(), true, false);
+        result
+    } else {
+        data.into()
+    };
+
+    let end = ascii_buf.iter()
+        .rposition(|&b| b != 0)
+        .map_or(0, |i| i + 1);
+
+    ascii_buf = ascii_buf[..end].to_vec();
+
+    let s = ascii_buf.chunks(80)
+        .map(|line| std::str::from_utf8(line))
+        .collect::<Result<Vec<_>, _>>()?
+        .join("\n");
+
+    Ok(s)
+}
+
+fn binary_header_to_dict<'py>(py: Python<'py>, b_header: &BinaryHeader) -> PyResult<Bound<'py, PyDict>> {
+    let dict = PyDict::new(py);
+    dict.set_item("Sample Interval", b_header.sample_interval)?;
+    dict.set_item("Samples Per Trace", b_header.samples_per_trace)?;
+    dict.set_item("Bytes Per Sample", b_header.bytes_per_sample)?;
+    dict.set_item("Extended Text Header Count", b_header.extended_text_header_count)?;
+
+    let data_format = match b_header.data_format {
+        DataFormat::IBMf32 => "IBMf32",
+        DataFormat::I32 => "I32",
+        DataFormat::I16 => "I16",
+        DataFormat::FixedPointWGain => "Fixed Point With Gain",
+        DataFormat::IEEf32 => "IEEf32",
+        DataFormat::I8 => "I8",
+    };
+    dict.set_item("Data Format", data_format)?;
+
+    let byte_order = match b_header.byte_order {
+        ByteOrder::BigEndian => "Big Endian",
+        ByteOrder::LittleEndian => "Little Endian",
+        ByteOrder::SwappedWord => "Swapped Word",
+    };
+    dict.set_item("Byte Order", byte_order)?;
+
+    Ok(dict)
+}
+
 #[derive(Debug)]
 struct BinaryHeader{
     sample_interval: i16,
@@ -34,7 +242,7 @@ struct BinaryHeader{
 }
 
 // Only handles data formats compatible with Revision standard <= 1
-#[derive(Debug)]
+#[derive(Debug, Copy, Clone, PartialEq)]
 enum DataFormat{
     IBMf32,         // Code: 1      bytes: 4
     I32,            // 2            4
@@ -44,26 +252,273 @@ enum DataFormat{
     I8,             // 8            1
 }
 
-#[derive(Debug, Copy, Clone)]
+impl DataFormat {
+    fn from_code(code: i16) -> Result<Self, SegyError> {
+        match code {
+            1 => Ok(DataFormat::IBMf32),
+            2 => Ok(DataFormat::I32),
+            3 => Ok(DataFormat::I16),
+            4 => Ok(DataFormat::FixedPointWGain),
+            5 => Ok(DataFormat::IEEf32),
+            8 => Ok(DataFormat::I8),
+            _ => Err(SegyError::UnsupportedDataFormat),
+        }
+    }
+
+    fn code(&self) -> i16 {
+        match self {
+            DataFormat::IBMf32 => 1,
+            DataFormat::I32 => 2,
+            DataFormat::I16 => 3,
+            DataFormat::FixedPointWGain => 4,
+            DataFormat::IEEf32 => 5,
+            DataFormat::I8 => 8,
+        }
+    }
+
+    fn bytes_per_sample(&self) -> usize {
+        match self {
+            DataFormat::I16 => 2,
+            DataFormat::I8 => 1,
+            _ => 4,
+        }
+    }
+}
+
+#[derive(Debug, Copy, Clone, PartialEq)]
 enum ByteOrder{
     BigEndian,
     LittleEndian,
     SwappedWord,
 }
 
+// Access pattern hint passed to the kernel for the whole memory map
+#[derive(Debug, Copy, Clone)]
+enum AccessPattern{
+    Normal,
+    Sequential,
+    Random,
+    WillNeed,
+}
+
+impl AccessPattern {
+    fn parse(access: &str) -> Result<Self, SegyError> {
+        match access {
+            "normal" => Ok(AccessPattern::Normal),
+            "sequential" => Ok(AccessPattern::Sequential),
+            "random" => Ok(AccessPattern::Random),
+            "willneed" => Ok(AccessPattern::WillNeed),
+            _ => Err(SegyError::InvalidAccessPattern(access.to_string())),
+        }
+    }
+
+    fn as_str(&self) -> &'static str {
+        match self {
+            AccessPattern::Normal => "normal",
+            AccessPattern::Sequential => "sequential",
+            AccessPattern::Random => "random",
+            AccessPattern::WillNeed => "willneed",
+        }
+    }
+}
+
+// Commonly used 4-byte trace header fields: (name, 1-based byte position)
+const TRACE_HEADER_FIELDS: &[(&str, usize)] = &[
+    ("tracl", 1),
+    ("tracr", 5),
+    ("fldr", 9),
+    ("ffid", 9),
+    ("tracf", 13),
+    ("ep", 17),
+    ("cdp", 21),
+    ("cdpt", 25),
+    ("offset", 37),
+    ("sx", 73),
+    ("sy", 77),
+    ("gx", 81),
+    ("gy", 85),
+    ("cdp_x", 181),
+    ("cdp_y", 185),
+    ("iline", 189),
+    ("xline", 193),
+    ("sp", 197),
+    ("shot", 9),
+];
+
+// Resolves a field name from TRACE_HEADER_FIELDS or a 1-based byte position of a 4-byte field
+// into (index name, 0-based offset in the trace header)
+fn resolve_header_field(field: &Bound<'_, PyAny>) -> PyResult<(String, usize)> {
+    if let Ok(byte) = field.extract::<usize>() {
+        if byte == 0 || byte + 3 > 240 {
+            return Err(PyValueError::new_err(format!("Byte position {byte} is outside of the 240 byte trace header")));
+        }
+        return Ok((format!("byte{byte}"), byte - 1));
+    }
+
+    let name: String = field.extract()?;
+    TRACE_HEADER_FIELDS.iter()
+        .find(|(n, _)| *n == name)
+        .map(|&(n, byte)| (n.to_string(), byte - 1))
+        .ok_or_else(|| PyValueError::new_err(SegyError::UnknownHeaderField(name).to_string()))
+}
+
+// Trace numbers (0-based) sorted by the value of one trace header field
+#[derive(Debug, Clone)]
+struct HeaderIndex{
+    offset: usize,
+    keys: Vec<i32>,
+    traces: Vec<u32>,
+}
+
+const HEADER_INDEX_MAGIC: &[u8; 8] = b"FSIDX002";
+const HEADER_INDEX_PREFIX: usize = 48;
+
+impl HeaderIndex {
+    // 0-based trace numbers with value_min <= key <= value_max, in file order within each key
+    fn lookup(&self, value_min: i32, value_max: i32) -> &[u32] {
+        let lo = self.keys.partition_point(|&k| k < value_min);
+        let hi = self.keys.partition_point(|&k| k <= value_max);
+
+        if lo >= hi { &[] } else { &self.traces[lo..hi] }
+    }
+
+    // Layout (little endian): magic, stamp (trace count, file length, modification time),
+    // field offset, entry count, keys, traces. The stamp lets a stale index be detected after the
+    // SEG-Y file changed, see SegyFile::index_stamp.
+    fn to_bytes(&self, stamp: [u64; 3]) -> Vec<u8> {
+        let mut buf = Vec::with_capacity(HEADER_INDEX_PREFIX + self.keys.len() * 8);
+        buf.extend_from_slice(HEADER_INDEX_MAGIC);
+        stamp.iter().for_each(|v| buf.extend_from_slice(&v.to_le_bytes()));
+        buf.extend_from_slice(&(self.offset as u64).to_le_bytes());
+        buf.extend_from_slice(&(self.keys.len() as u64).to_le_bytes());
+        self.keys.iter().for_each(|k| buf.extend_from_slice(&k.to_le_bytes()));
+        self.traces.iter().for_each(|t| buf.extend_from_slice(&t.to_le_bytes()));
+
+        buf
+    }
+
+    fn from_bytes(buf: &[u8], stamp: [u64; 3]) -> Option<Self> {
+        if buf.len() < HEADER_INDEX_PREFIX || &buf[..8] != HEADER_INDEX_MAGIC {
+            return None;
+        }
+
+        let read_u64 = |at: usize| u64::from_le_bytes(buf[at..at + 8].try_into().unwrap());
+        if [read_u64(8), read_u64(16), read_u64(24)] != stamp {
+            return None;
+        }
+
+        let offset = read_u64(32) as usize;
+        let n = read_u64(40) as usize;
+        if n.checked_mul(8).and_then(|b| b.checked_add(HEADER_INDEX_PREFIX)) != Some(buf.len()) {
+            return None;
+        }
+
+        let keys = buf[HEADER_INDEX_PREFIX..HEADER_INDEX_PREFIX + n * 4]
+            .chunks_exact(4)
+            .map(|b| i32::from_le_bytes([b[0], b[1], b[2], b[3]]))
+            .collect();
+        let traces = buf[HEADER_INDEX_PREFIX + n * 4..]
+            .chunks_exact(4)
+            .map(|b| u32::from_le_bytes([b[0], b[1], b[2], b[3]]))
+            .collect();
+
+        Some(Self{offset, keys, traces})
+    }
+}
+
 #[pyclass]
 struct SegyFile{
+    path: String,
     b_header: BinaryHeader,
     trace_index: Vec<u64>,
     mmap: Mmap,
     trace_count: u64,
+    file: File,
+    access: AccessPattern,
+    populate: bool,
+    // Modification time of the file when it was opened, nanoseconds since the Unix epoch
+    modified: u64,
+    // Amplitude statistics together with the trace budget they were computed with (None - whole file)
+    statistics: Mutex<Option<(Option<usize>, AmplitudeStats)>>,
+    header_indexes: Mutex<HashMap<String, HeaderIndex>>,
 }
 
 #[pymethods]
 impl SegyFile {
     #[new]
-    fn new(path: &str) -> PyResult<Self> {
-        Self::open_segy(path)
+    #[pyo3(signature = (path, access="normal", populate=false))]
+    fn new(py: Python<'_>, path: &str, access: &str, populate: bool) -> PyResult<Self> {
+        let access = AccessPattern::parse(access)
+            .map_err(|e| PyValueError::new_err(e.to_string()))?;
+
+        // Indexing walks every trace header, other Python threads (e.g. the GUI) keep running meanwhile
+        py.detach(|| Self::open_segy(path, access, populate, None))
+    }
+
+    #[getter]
+    fn trace_count(&self) -> u64 {
+        self.trace_count
+    }
+
+    // Pickles as the path, open options and the already built indexes - never as trace data.
+    // Unpickling remaps the file and skips the header walk.
+    fn __reduce__<'py>(
+        &self,
+        py: Python<'py>,
+    ) -> PyResult<(Bound<'py, PyAny>, (String, &'static str, bool, Bound<'py, PyBytes>, Vec<(String, Bound<'py, PyBytes>)>))> {
+        let rebuild = py.import("fastsegy._fastsegy")?.getattr("_rebuild_segy_file")?;
+
+        let trace_index: Vec<u8> = self.trace_index.iter().flat_map(|o| o.to_le_bytes()).collect();
+        let header_indexes: Vec<(String, Bound<'py, PyBytes>)> = self.header_indexes.lock().unwrap()
+            .iter()
+            .map(|(name, index)| {
+                let bytes = index.to_bytes(self.index_stamp());
+                (name.clone(), PyBytes::new(py, &bytes))
+            })
+            .collect();
+
+        Ok((
+            rebuild,
+            (self.path.clone(), self.access.as_str(), self.populate, PyBytes::new(py, &trace_index), header_indexes),
+        ))
+    }
+
+    /// Applies func to consecutive chunks of chunk_traces traces in a pool of worker processes
+    /// and yields the results in order. See fastsegy.parallel.map_chunks.
+    #[pyo3(signature = (func, chunk_traces=1000, workers=None))]
+    fn map_chunks<'py>(
+        slf: &Bound<'py, Self>,
+        func: Bound<'py, PyAny>,
+        chunk_traces: usize,
+        workers: Option<usize>,
+    ) -> PyResult<Bound<'py, PyAny>> {
+        let py = slf.py();
+        py.import("fastsegy.parallel")?
+            .getattr("map_chunks")?
+            .call1((slf, func, chunk_traces, workers))
+    }
+
+    #[getter]
+    fn access(&self) -> &'static str {
+        self.access.as_str()
+    }
+
+    /// Asks the kernel to start reading traces start..=end (1-based) into the page cache
+    fn prefetch(&self, start: u32, end: u32) -> PyResult<()> {
+        let (offset, len) = self.trace_range_bytes(start, end)
+            .map_err(|e| PyTypeError::new_err(e.to_string()))?;
+
+        advise_willneed(&self.mmap, offset, len)
+            .map_err(|e| PyIOError::new_err(e.to_string()))
+    }
+
+    /// Drops traces start..=end (1-based) from this mapping and, where supported, from the page cache
+    fn evict(&self, start: u32, end: u32) -> PyResult<()> {
+        let (offset, len) = self.trace_range_bytes(start, end)
+            .map_err(|e| PyTypeError::new_err(e.to_string()))?;
+
+        advise_dontneed(&self.mmap, &self.file, offset, len)
+            .map_err(|e| PyIOError::new_err(e.to_string()))
     }
 
     fn get_trace<'py>(&self, py: Python<'py>, trace_number: u32) -> PyResult<Bound<'py, PyAny>> {
@@ -81,119 +536,174 @@ impl SegyFile {
         start: u32,
         end: u32,
     ) -> PyResult<Bound<'py, PyAny>> {
-        let traces = self
-            .get_trace_range_data(start, end)
+        let traces = py.detach(|| self.get_trace_range_data(start, end))
             .map_err(|e| PyTypeError::new_err(e.to_string()))?;
 
-        if traces.is_empty() {
-            return Err(PyTypeError::new_err("Got empty array"));
-        }
-
-        match &traces[0] {
-            TraceData::F32(_) => {
-                let vec2: Vec<Vec<f32>> = traces
-                    .into_iter()
-                    .map(|t| if let TraceData::F32(v) = t { v } else { unreachable!() })
-                    .collect();
-                let array = PyArray2::from_vec2(py, &vec2)
-                    .map_err(|e| PyTypeError::new_err(format!("from_vec2 error: {:?}", e)))?;
-                Ok(array.into_any())
-            }
-            TraceData::I16(_) => {
-                let vec2: Vec<Vec<i16>> = traces
-                    .into_iter()
-                    .map(|t| if let TraceData::I16(v) = t { v } else { unreachable!() })
-                    .collect();
-                let array = PyArray2::from_vec2(py, &vec2)
-                    .map_err(|e| PyTypeError::new_err(format!("from_vec2 error: {:?}", e)))?;
-                Ok(array.into_any())
-            }
-            TraceData::I32(_) => {
-                let vec2: Vec<Vec<i32>> = traces
-                    .into_iter()
-                    .map(|t| if let TraceData::I32(v) = t { v } else { unreachable!() })
-                    .collect();
-                let array = PyArray2::from_vec2(py, &vec2)
-                    .map_err(|e| PyTypeError::new_err(format!("from_vec2 error: {:?}", e)))?;
-                Ok(array.into_any())
-            }
-            TraceData::I8(_) => {
-                let vec2: Vec<Vec<i8>> = traces
-                    .into_iter()
-                    .map(|t| if let TraceData::I8(v) = t { v } else { unreachable!() })
-                    .collect();
-                let array = PyArray2::from_vec2(py, &vec2)
-                    .map_err(|e| PyTypeError::new_err(format!("from_vec2 error: {:?}", e)))?;
-                Ok(array.into_any())
-            }
-        }
+        traces_to_numpy2(py, traces)
     }
 
     fn get_metadata<'py>(&self, py: Python<'py>) -> PyResult<Bound<'py, PyDict>> {
-        let b_header: &BinaryHeader = &self.b_header;
-
-        let dict = PyDict::new(py);
-        dict.set_item("Sample Interval", b_header.sample_interval)?;
-        dict.set_item("Samples Per Trace", b_header.samples_per_trace)?;
-        dict.set_item("Bytes Per Sample", b_header.bytes_per_sample)?;
-        dict.set_item("Extended Text Header Count", b_header.extended_text_header_count)?;
-
-        let data_format = match b_header.data_format {
-            DataFormat::IBMf32 => "IBMf32",
-            DataFormat::I32 => "I32",
-            DataFormat::I16 => "I16",
-            DataFormat::FixedPointWGain => "Fixed Point With Gain",
-            DataFormat::IEEf32 => "IEEf32",
-            DataFormat::I8 => "I8",
-        };
-        dict.set_item("Data Format", data_format)?;
-
-        let byte_order = match b_header.byte_order {
-            ByteOrder::BigEndian => "Big Endian",
-            ByteOrder::LittleEndian => "Little Endian",
-            ByteOrder::SwappedWord => "Swapped Word",
-        };
-        dict.set_item("Byte Order", byte_order)?;
+        let dict = binary_header_to_dict(py, &self.b_header)?;
         dict.set_item("Index", &self.trace_index)?;
         dict.set_item("Trace Count", &self.trace_count)?;
 
         Ok(dict)
     }
 
-    fn get_header<'py>(&self, py: Python<'py>) -> PyResult<Bound<'py, PyString>> {
-        let data = &self.mmap[..3200];
-
-        // In All Revision standards: textual header is 3200 bytes, padded with:
-        // - 0x40 (EBCDIC space) for EBCDIC encoding
-        // - 0x20 (ASCII space) for ASCII encoding
-        // This implementation checks last byte to determine encoding
-        // This should work every time, as it is extremely unlikely for a textual header to fill all 3200 bytes
-        let is_ebcdic = data[3199] == 0x40;
-        let mut ascii_buf = if is_ebcdic {
-            let mut result = vec![0u8; 3200];
-            Ebcdic::ebcdic_to_ascii(&data, &mut result, data.len(), true, false);
-            result
-        } else {
-            data.into()
-        };
+    /// Computes min/max/mean/RMS and an amplitude histogram in one parallel pass over the file.
+    /// With max_traces set, only that many traces spread evenly across the file are scanned.
+    /// The result is cached until called with a different max_traces or refresh=True.
+    #[pyo3(signature = (max_traces=None, refresh=false))]
+    fn compute_statistics<'py>(
+        &self,
+        py: Python<'py>,
+        max_traces: Option<usize>,
+        refresh: bool,
+    ) -> PyResult<Bound<'py, PyDict>> {
+        let stats = py.detach(|| self.cached_statistics(max_traces, refresh))
+            .map_err(|e| PyTypeError::new_err(e.to_string()))?;
+
+        let dict = PyDict::new(py);
+        dict.set_item("Count", stats.count)?;
+        dict.set_item("Traces Scanned", stats.traces_scanned)?;
+        dict.set_item("Non Finite", stats.non_finite)?;
+        dict.set_item("Min", stats.min)?;
+        dict.set_item("Max", stats.max)?;
+        dict.set_item("Mean", stats.mean())?;
+        dict.set_item("RMS", stats.rms())?;
+        dict.set_item("Histogram", stats.histogram.clone().into_pyarray(py))?;
+        dict.set_item("Bin Edges", AmplitudeStats::bin_edges().into_pyarray(py))?;
+
+        Ok(dict)
+    }
+
+    /// Looks up the p-th percentile (0..100) of absolute amplitudes in the cached histogram,
+    /// computing whole-file statistics first if none are cached
+    fn amplitude_percentile(&self, py: Python<'_>, p: f64) -> PyResult<f64> {
+        if !(0.0..=100.0).contains(&p) {
+            return Err(PyValueError::new_err("Percentile must be in range 0..100"));
+        }
+
+        let cached = self.statistics.lock().unwrap().as_ref().map(|(_, stats)| stats.percentile(p));
+        if let Some(value) = cached {
+            return Ok(value);
+        }
+
+        let stats = py.detach(|| self.cached_statistics(None, false))
+            .map_err(|e| PyTypeError::new_err(e.to_string()))?;
+
+        Ok(stats.percentile(p))
+    }
 
-        let end = ascii_buf.iter()
-            .rposition(|&b| b != 0)
-            .map_or(0, |i| i + 1);
+    /// Scans one trace header field of every trace in parallel and keeps a sorted value -> trace mapping.
+    /// field is a name (e.g. "cdp", "fldr", "iline") or a 1-based byte position of a 4-byte field.
+    /// An index saved next to the file (<path>.<field>.idx) is reused, persist=True writes one.
+    #[pyo3(signature = (field, persist=false))]
+    fn build_index(&self, py: Python<'_>, field: &Bound<'_, PyAny>, persist: bool) -> PyResult<()> {
+        let (name, offset) = resolve_header_field(field)?;
+
+        py.detach(|| -> Result<(), SegyError> {
+            let index = match self.load_header_index(&name, offset) {
+                Some(index) => index,
+                None => self.scan_header_index(offset),
+            };
 
-        ascii_buf = ascii_buf[..end].to_vec();
+            if persist {
+                let bytes = index.to_bytes(self.index_stamp());
+                std::fs::write(self.header_index_path(&name), bytes)?;
+            }
 
-        let s = ascii_buf.chunks(80)
-            .map(|line| std::str::from_utf8(line))
-            .collect::<Result<Vec<_>, _>>()?
-            .join("\n");
+            self.header_indexes.lock().unwrap().insert(name, index);
+            Ok(())
+        }).map_err(|e| PyIOError::new_err(e.to_string()))
+    }
+
+    /// Returns 1-based numbers of traces whose field value lies in value_min..=value_max
+    #[pyo3(signature = (field, value_min, value_max=None))]
+    fn find_traces<'py>(
+        &self,
+        py: Python<'py>,
+        field: &Bound<'py, PyAny>,
+        value_min: i32,
+        value_max: Option<i32>,
+    ) -> PyResult<Bound<'py, PyAny>> {
+        let targets = self.lookup_traces(py, field, value_min, value_max.unwrap_or(value_min))?;
+        let numbers: Vec<u32> = targets.iter().map(|t| t + 1).collect();
+
+        Ok(numbers.into_pyarray(py).into_any())
+    }
+
+    /// Returns all traces with the given field value as a 2D array [traces, samples]
+    fn get_gather<'py>(&self, py: Python<'py>, field: &Bound<'py, PyAny>, value: i32) -> PyResult<Bound<'py, PyAny>> {
+        self.get_gather_range(py, field, value, value)
+    }
+
+    /// Returns all traces with value_min <= field value <= value_max as a 2D array [traces, samples],
+    /// ordered by field value and then by position in the file
+    fn get_gather_range<'py>(
+        &self,
+        py: Python<'py>,
+        field: &Bound<'py, PyAny>,
+        value_min: i32,
+        value_max: i32,
+    ) -> PyResult<Bound<'py, PyAny>> {
+        let targets = self.lookup_traces(py, field, value_min, value_max)?;
+
+        if targets.is_empty() {
+            return Err(PyValueError::new_err(format!(
+                "No traces with {} in range {value_min}..={value_max}", field
+            )));
+        }
+
+        let traces = py.detach(|| self.get_traces_data(&targets))
+            .map_err(|e| PyTypeError::new_err(e.to_string()))?;
+
+        traces_to_numpy2(py, traces)
+    }
+
+    /// Scans all trace headers and payloads in parallel and returns a summary together with
+    /// a per-trace array of TRACE_* status flags. With strict=True the first damaged trace raises IOError.
+    #[pyo3(signature = (strict=false))]
+    fn validate<'py>(&self, py: Python<'py>, strict: bool) -> PyResult<Bound<'py, PyDict>> {
+        let (status, trailing_bytes) = py.detach(|| self.validate_traces());
+
+        if strict {
+            if let Some(bad) = status.iter().position(|&flags| flags != TRACE_OK) {
+                return Err(PyIOError::new_err(SegyError::CorruptTrace(bad + 1).to_string()));
+            }
+        }
+
+        let count_flag = |flag: u8| status.iter().filter(|&&flags| flags & flag != 0).count();
+
+        let dict = PyDict::new(py);
+        dict.set_item("Traces", status.len())?;
+        dict.set_item("OK", status.iter().filter(|&&flags| flags == TRACE_OK).count())?;
+        dict.set_item("Truncated", count_flag(TRACE_TRUNCATED))?;
+        dict.set_item("Sample Count Mismatch", count_flag(TRACE_SAMPLE_COUNT))?;
+        dict.set_item("Non Finite", count_flag(TRACE_NON_FINITE))?;
+        dict.set_item("Denormal", count_flag(TRACE_DENORMAL))?;
+        dict.set_item("IBM Exponent Out Of Range", count_flag(TRACE_IBM_EXPONENT))?;
+        dict.set_item("Trailing Bytes", trailing_bytes)?;
+        dict.set_item("Status", status.into_pyarray(py))?;
+
+        Ok(dict)
+    }
+
+    fn get_header<'py>(&self, py: Python<'py>) -> PyResult<Bound<'py, PyString>> {
+        let s = decode_text_header(&self.mmap[..3200])?;
 
         Ok(PyString::new(py, &s))
     }
 }
 
 impl SegyFile{
-    fn open_segy(path: &str) -> PyResult<Self>{
+    // A trace index known from a previous open (e.g. an unpickled SegyFile) skips the header walk
+    fn open_segy(
+        path: &str,
+        access: AccessPattern,
+        populate: bool,
+        known_index: Option<Vec<u64>>,
+    ) -> PyResult<Self>{
         // SAFETY:
         // As per memmap2 documentation All file-backed memory map constructors are marked unsafe
         // because of the potential for Undefined Behavior (UB) using the map if the underlying file
@@ -206,19 +716,55 @@ impl SegyFile{
         // during the lifetime of this `SegyFile`.
 
         let file = File::open(path)?;
+        let modified = file.metadata()?
+            .modified()
+            .ok()
+            .and_then(|t| t.duration_since(std::time::UNIX_EPOCH).ok())
+            .map_or(0, |d| d.as_nanos() as u64);
+        let mut options = MmapOptions::new();
+
+        // MAP_POPULATE pre-faults the whole file, only worth it for files that fit comfortably in memory
+        if populate {
+            options.populate();
+        }
+
         let mmap = unsafe {
-            MmapOptions::new().map(&file)?
+            options.map(&file)?
         };
+
+        // Hint is applied before indexing, so the header walk below already benefits from it
+        advise_access(&mmap, access)?;
+
         let b_header = match parse_binary_header(&mmap[3200..3600]){
             Ok(h) => h,
             Err(e) => return Err(PyIOError::new_err(format!("Failed to open file: {}", e)))
         };
-        let (trace_count, trace_index) = match Self::build_trace_index(&b_header, &mmap){
-            Ok((count, index)) => (count, index),
-            Err(e) => return Err(PyErr::new::<PyTypeError, _>(e)),
+
+        // A known index is only trusted if its last trace header still lies inside the file
+        let known_index = known_index
+            .filter(|index| index.last().map_or(false, |&last| last as usize + 240 <= mmap.len()));
+
+        let (trace_count, trace_index) = match known_index {
+            Some(index) => (index.len() as u64, index),
+            None => match Self::build_trace_index(&b_header, &mmap){
+                Ok((count, index)) => (count, index),
+                Err(e) => return Err(PyErr::new::<PyTypeError, _>(e)),
+            },
         };
 
-        Ok(Self{b_header, trace_index, mmap, trace_count})
+        Ok(Self{
+            path: path.to_string(),
+            b_header,
+            trace_index,
+            mmap,
+            trace_count,
+            file,
+            access,
+            populate,
+            modified,
+            statistics: Mutex::new(None),
+            header_indexes: Mutex::new(HashMap::new()),
+        })
     }
 
     fn build_trace_index(b_header: &BinaryHeader, mmap: &Mmap) -> Result<(u64, Vec<u64>), std::io::Error> {
@@ -226,23 +772,15 @@ impl SegyFile{
         // Hence it might(?) be necessary to walk through whole file and count traces manually
         let mut trace_index: Vec<u64> = Vec::new();
         let mut count: u64 = 0;
-        let mut offset = 3600 + b_header.extended_text_header_count as usize * 3200; //text header 3200, bin header 400
+        let mut offset = 3600 + b_header.extended_text_header_count.max(0) as usize * 3200; //text header 3200, bin header 400
 
         while offset + 240 < mmap.len(){
-            let samples_in_trace = read_i16(&mmap, offset+114, &b_header.byte_order);
-            let samples = if samples_in_trace == 0 {
-                b_header.samples_per_trace as u64
-            } else {
-                samples_in_trace as u64
-            };
-
-            let data_bytes = 240 + samples * b_header.bytes_per_sample as u64;
-            if offset + data_bytes as usize > mmap.len(){
+            let Some(data_bytes) = trace_payload_bytes(mmap, offset, b_header) else {
                 break;
-            }
+            };
 
             trace_index.push(offset as u64);
-            offset += data_bytes as usize;
+            offset += 240 + data_bytes;
             count += 1;
         }
 
@@ -266,21 +804,8 @@ impl SegyFile{
             });
         }
 
-        let target = trace_number - 1;
-        let trace_start = trace_index[target as usize];
-
-        let header: &[u8] = &self.mmap[trace_start as usize .. trace_start as usize + 240];
-        let samples_in_trace = read_i16(&header, 114, &b_header.byte_order);
-
-        let samples = if samples_in_trace == 0 {
-            b_header.samples_per_trace as u64
-        } else {
-            samples_in_trace as u64
-        };
-
-        let data_bytes = samples * b_header.bytes_per_sample as u64;
-        let data_start = trace_start as usize + 240;
-        let raw_buf = &self.mmap[data_start .. data_start + data_bytes as usize];
+        let (data_start, data_bytes) = self.trace_payload((trace_number - 1) as usize);
+        let raw_buf = &self.mmap[data_start .. data_start + data_bytes];
         let trace: TraceData = Self::decode_trace(&b_header, &byte_order, &raw_buf)?;
 
         Ok(trace)
@@ -309,19 +834,8 @@ impl SegyFile{
         let mut data: Vec<TraceData> = Vec::with_capacity((end - start + 1) as usize);
 
         for target in (start - 1) as usize ..end as usize{
-            let trace_start = trace_index[target];
-            let header: &[u8] = &self.mmap[trace_start as usize .. trace_start as usize + 240];
-            let samples_in_trace = read_i16(&header, 114, &b_header.byte_order);
-
-            let samples = if samples_in_trace == 0 {
-                b_header.samples_per_trace as u64
-            } else {
-                samples_in_trace as u64
-            };
-
-            let data_bytes = samples * b_header.bytes_per_sample as u64;
-            let data_start = trace_start as usize + 240;
-            let raw_buf = &self.mmap[data_start .. data_start + data_bytes as usize];
+            let (data_start, data_bytes) = self.trace_payload(target);
+            let raw_buf = &self.mmap[data_start .. data_start + data_bytes];
 
             let trace: TraceData = Self::decode_trace(&b_header, &byte_order, &raw_buf)?;
             data.push(trace);
@@ -330,6 +844,265 @@ impl SegyFile{
         Ok(data)
     }
 
+    // Returns (data_start, data_bytes) of an indexed trace, target is 0-based
+    fn trace_payload(&self, target: usize) -> (usize, usize) {
+        let trace_start = self.trace_index[target] as usize;
+
+        // Indexed traces always fit, unless an unpickled index no longer matches the file
+        let data_bytes = trace_payload_bytes(&self.mmap, trace_start, &self.b_header).unwrap_or(0);
+        (trace_start + 240, data_bytes)
+    }
+
+    // Returns (offset, len) in bytes covering traces start..=end (1-based), headers included
+    fn trace_range_bytes(&self, start: u32, end: u32) -> Result<(usize, usize), SegyError> {
+        if start == 0 || start > end || end > self.trace_index.len() as u32 {
+            return Err(SegyError::InvalidTraceRange {
+                start,
+                end,
+                trace_count: self.trace_index.len(),
+            });
+        }
+
+        let offset = self.trace_index[(start - 1) as usize] as usize;
+        let (data_start, data_bytes) = self.trace_payload((end - 1) as usize);
+
+        Ok((offset, data_start + data_bytes - offset))
+    }
+
+    // Decodes the given traces (0-based) in parallel, keeping their order
+    fn get_traces_data(&self, targets: &[u32]) -> Result<Vec<TraceData>, SegyError> {
+        targets
+            .par_iter()
+            .map(|&target| {
+                let (data_start, data_bytes) = self.trace_payload(target as usize);
+                let raw_buf = &self.mmap[data_start .. data_start + data_bytes];
+                Self::decode_trace(&self.b_header, &self.b_header.byte_order, raw_buf)
+            })
+            .collect()
+    }
+
+    fn header_index_path(&self, name: &str) -> String {
+        format!("{}.{}.idx", self.path, name)
+    }
+
+    // Identifies this version of the file in saved and pickled header indexes. The modification time
+    // catches rewrites that keep the file size.
+    fn index_stamp(&self) -> [u64; 3] {
+        [self.trace_count, self.mmap.len() as u64, self.modified]
+    }
+
+    fn load_header_index(&self, name: &str, offset: usize) -> Option<HeaderIndex> {
+        let buf = std::fs::read(self.header_index_path(name)).ok()?;
+
+        HeaderIndex::from_bytes(&buf, self.index_stamp())
+            .filter(|index| index.offset == offset)
+    }
+
+    fn scan_header_index(&self, offset: usize) -> HeaderIndex {
+        let byte_order = &self.b_header.byte_order;
+        let mut entries: Vec<(i32, u32)> = self.trace_index
+            .par_iter()
+            .enumerate()
+            .map(|(target, &trace_start)| (read_i32(&self.mmap, trace_start as usize + offset, byte_order), target as u32))
+            .collect();
+
+        // Sorting the (key, trace) pairs keeps traces of one key in file order
+        entries.par_sort_unstable();
+        let (keys, traces) = entries.into_iter().unzip();
+
+        HeaderIndex{offset, keys, traces}
+    }
+
+    // Returns 0-based trace numbers matching the range. Without an index in memory, one saved
+    // next to the file is loaded, otherwise the headers are scanned.
+    fn lookup_traces(&self, py: Python<'_>, field: &Bound<'_, PyAny>, value_min: i32, value_max: i32) -> PyResult<Vec<u32>> {
+        let (name, offset) = resolve_header_field(field)?;
+
+        if !self.header_indexes.lock().unwrap().contains_key(&name) {
+            let index = py.detach(|| {
+                self.load_header_index(&name, offset)
+                    .unwrap_or_else(|| self.scan_header_index(offset))
+            });
+            self.header_indexes.lock().unwrap().insert(name.clone(), index);
+        }
+
+        let indexes = self.header_indexes.lock().unwrap();
+        Ok(indexes[&name].lookup(value_min, value_max).to_vec())
+    }
+
+    // Returns TRACE_* flags of every trace and the number of bytes left after the last complete trace.
+    // Traces with a damaged sample count are flagged and checked with the binary header's length.
+    // Bytes left over are reported as one extra truncated trace.
+    fn validate_traces(&self) -> (Vec<u8>, usize) {
+        let b_header = &self.b_header;
+
+        let mut status: Vec<u8> = (0..self.trace_index.len())
+            .into_par_iter()
+            .map(|target| {
+                let trace_start = self.trace_index[target] as usize;
+                let samples_in_trace = read_i16(&self.mmap, trace_start + 114, &b_header.byte_order);
+                let (data_start, data_bytes) = self.trace_payload(target);
+
+                let mut flags = check_samples(
+                    &self.mmap[data_start .. data_start + data_bytes],
+                    &b_header.data_format,
+                    &b_header.byte_order,
+                );
+
+                // A positive sample count whose payload would run past the end of the file
+                let declared = declared_samples(&self.mmap, trace_start, b_header);
+                let declared_end = (declared.max(0) as usize)
+                    .checked_mul(b_header.bytes_per_sample as usize)
+                    .and_then(|bytes| bytes.checked_add(data_start));
+                if declared > 0 && declared_end.map_or(true, |end| end > self.mmap.len()) {
+                    flags |= TRACE_TRUNCATED;
+                }
+
+                let consistent = match (samples_in_trace, b_header.samples_per_trace) {
+                    (0, expected) => expected > 0,
+                    (actual, expected) => actual > 0 && (expected <= 0 || actual == expected),
+                };
+                if !consistent {
+                    flags |= TRACE_SAMPLE_COUNT;
+                }
+
+                flags
+            })
+            .collect();
+
+        let data_end = match self.trace_index.len() {
+            0 => (3600 + b_header.extended_text_header_count.max(0) as usize * 3200).min(self.mmap.len()),
+            n => {
+                let (data_start, data_bytes) = self.trace_payload(n - 1);
+                data_start + data_bytes
+            },
+        };
+        let trailing_bytes = self.mmap.len().saturating_sub(data_end);
+
+        if trailing_bytes > 0 {
+            let mut flags = TRACE_TRUNCATED;
+            if trailing_bytes >= 240 && read_i16(&self.mmap, data_end + 114, &b_header.byte_order) < 0 {
+                flags |= TRACE_SAMPLE_COUNT;
+            }
+            status.push(flags);
+        }
+
+        (status, trailing_bytes)
+    }
+
+    fn cached_statistics(&self, max_traces: Option<usize>, refresh: bool) -> Result<AmplitudeStats, SegyError> {
+        if !refresh {
+            if let Some((budget, stats)) = self.statistics.lock().unwrap().as_ref() {
+                if *budget == max_traces {
+                    return Ok(stats.clone());
+                }
+            }
+        }
+
+        let stats = self.compute_statistics_data(max_traces)?;
+        *self.statistics.lock().unwrap() = Some((max_traces, stats.clone()));
+
+        Ok(stats)
+    }
+
+    fn compute_statistics_data(&self, max_traces: Option<usize>) -> Result<AmplitudeStats, SegyError> {
+        let trace_count = self.trace_index.len();
+        let scanned = match max_traces {
+            Some(m) if m < trace_count => m,
+            _ => trace_count,
+        };
+
+        // Stratified subsample - k-th scanned trace is taken from the k-th of `scanned` equal parts of the file
+        (0..scanned)
+            .into_par_iter()
+            .map(|k| k * trace_count / scanned)
+            .try_fold(AmplitudeStats::new, |mut stats, target| -> Result<AmplitudeStats, SegyError> {
+                let (data_start, data_bytes) = self.trace_payload(target);
+                let raw_buf = &self.mmap[data_start .. data_start + data_bytes];
+                let trace = Self::decode_trace(&self.b_header, &self.b_header.byte_order, raw_buf)?;
+
+                stats.add_trace(&trace);
+                Ok(stats)
+            })
+            .try_reduce(AmplitudeStats::new, |a, b| Ok(a.merge(b)))
+    }
+
+    // Writes the file to dst with samples converted to format/order, returns the number of traces written.
+    // Blocks of traces are converted in parallel while a writer thread streams the previous block to disk.
+    fn transcode_to(&self, dst: &str, format: DataFormat, order: ByteOrder) -> Result<u64, SegyError> {
+        let headers_end = (3600 + self.b_header.extended_text_header_count.max(0) as usize * 3200).min(self.mmap.len());
+        let mut headers = self.mmap[..headers_end].to_vec();
+        convert_header(
+            &self.mmap[3200..3600],
+            &mut headers[3200..3600],
+            BINARY_HEADER_LAYOUT,
+            &self.b_header.byte_order,
+            &order,
+        );
+        write_i16(&mut headers, 3200 + 24, format.code(), &order);
+        write_i32(&mut headers, 3200 + 96, 0x0102_0304, &order);
+
+        let trace_bytes = 240 + self.b_header.samples_per_trace.max(1) as usize * format.bytes_per_sample();
+        let block_traces = (TRANSCODE_BLOCK_BYTES / trace_bytes).max(1);
+
+        let file = File::create(dst)?;
+        let (sender, receiver) = sync_channel::<Vec<Vec<u8>>>(2);
+        let writer = std::thread::spawn(move || -> std::io::Result<()> {
+            let mut out = BufWriter::with_capacity(STREAM_BLOCK_BYTES, file);
+            out.write_all(&headers)?;
+            for block in receiver {
+                for trace in block {
+                    out.write_all(&trace)?;
+                }
+            }
+            out.flush()
+        });
+
+        let mut result = Ok(self.trace_count);
+        for start in (0..self.trace_index.len()).step_by(block_traces) {
+            let end = (start + block_traces).min(self.trace_index.len());
+            let block = (start..end)
+                .into_par_iter()
+                .map(|target| self.transcode_trace(target, format, &order))
+                .collect::<Result<Vec<_>, _>>();
+
+            match block {
+                // A failed send means the writer stopped on an I/O error, reported by join below
+                Ok(block) => if sender.send(block).is_err() { break; },
+                Err(e) => {
+                    result = Err(e);
+                    break;
+                },
+            }
+        }
+
+        drop(sender);
+        let written = writer.join().expect("transcode writer thread panicked");
+        let result = written.map_err(SegyError::from).and(result);
+        if result.is_err() {
+            let _ = std::fs::remove_file(dst);
+        }
+
+        result
+    }
+
+    // Header and samples of one trace (0-based) in the target format and byte order
+    fn transcode_trace(&self, target: usize, format: DataFormat, order: &ByteOrder) -> Result<Vec<u8>, SegyError> {
+        let trace_start = self.trace_index[target] as usize;
+        let (data_start, data_bytes) = self.trace_payload(target);
+        let header = &self.mmap[trace_start..trace_start + 240];
+        let samples = data_bytes / self.b_header.bytes_per_sample as usize;
+
+        let mut out = Vec::with_capacity(240 + samples * format.bytes_per_sample());
+        out.extend_from_slice(header);
+        convert_header(header, &mut out, TRACE_HEADER_LAYOUT, &self.b_header.byte_order, order);
+
+        let raw_buf = &self.mmap[data_start..data_start + data_bytes];
+        transcode_samples(raw_buf, &self.b_header, format, order, &mut out)?;
+
+        Ok(out)
+    }
+
     fn decode_trace(b_header: &BinaryHeader, byte_order: &ByteOrder, raw_buf: &[u8]) -> Result<TraceData, SegyError> {
         let trace = match b_header.data_format {
             DataFormat::IBMf32 => decode_ibm_trace(&raw_buf, &byte_order),
@@ -344,6 +1117,116 @@ impl SegyFile{
     }
 }
 
+// Appends the samples of raw_buf converted to format/order to out
+fn transcode_samples(
+    raw_buf: &[u8],
+    b_header: &BinaryHeader,
+    format: DataFormat,
+    order: &ByteOrder,
+    out: &mut Vec<u8>,
+) -> Result<(), SegyError> {
+    let from = &b_header.byte_order;
+    let mut word = [0u8; 4];
+
+    if b_header.data_format == format {
+        // Only the byte order changes, samples are copied bit for bit
+        match format.bytes_per_sample() {
+            1 => out.extend_from_slice(raw_buf),
+            2 => for b in raw_buf.chunks_exact(2) {
+                write_i16(&mut word, 0, read_i16(b, 0, from), order);
+                out.extend_from_slice(&word[..2]);
+            },
+            _ => for b in raw_buf.chunks_exact(4) {
+                write_i32(&mut word, 0, read_i32(b, 0, from), order);
+                out.extend_from_slice(&word);
+            },
+        }
+        return Ok(());
+    }
+
+    let encode: fn(f32) -> u32 = match format {
+        DataFormat::IEEf32 => f32::to_bits,
+        DataFormat::IBMf32 => ibmf32_word,
+        _ => return Err(SegyError::UnsupportedDataFormat),
+    };
+    let mut push = |value: f32| {
+        write_i32(&mut word, 0, encode(value) as i32, order);
+        out.extend_from_slice(&word);
+    };
+
+    match SegyFile::decode_trace(b_header, from, raw_buf)? {
+        TraceData::F32(v) => v.into_iter().for_each(|x| push(x)),
+        TraceData::I16(v) => v.into_iter().for_each(|x| push(x as f32)),
+        TraceData::I32(v) => v.into_iter().for_each(|x| push(x as f32)),
+        TraceData::I8(v) => v.into_iter().for_each(|x| push(x as f32)),
+    }
+
+    Ok(())
+}
+
+#[cfg(unix)]
+fn advise_access(mmap: &Mmap, access: AccessPattern) -> std::io::Result<()> {
+    let advice = match access {
+        AccessPattern::Normal => Advice::Normal,
+        AccessPattern::Sequential => Advice::Sequential,
+        AccessPattern::Random => Advice::Random,
+        AccessPattern::WillNeed => Advice::WillNeed,
+    };
+
+    mmap.advise(advice)
+}
+
+#[cfg(not(unix))]
+fn advise_access(_mmap: &Mmap, _access: AccessPattern) -> std::io::Result<()> {
+    Ok(())
+}
+
+#[cfg(unix)]
+fn advise_willneed(mmap: &Mmap, offset: usize, len: usize) -> std::io::Result<()> {
+    mmap.advise_range(Advice::WillNeed, offset, len)
+}
+
+#[cfg(not(unix))]
+fn advise_willneed(_mmap: &Mmap, _offset: usize, _len: usize) -> std::io::Result<()> {
+    Ok(())
+}
+
+#[cfg(unix)]
+fn advise_dontneed(mmap: &Mmap, file: &File, offset: usize, len: usize) -> std::io::Result<()> {
+    // SAFETY:
+    // The map is read-only and file-backed, so dropping its pages never loses data - the next access
+    // simply faults them back in from the file.
+    unsafe {
+        mmap.unchecked_advise_range(UncheckedAdvice::DontNeed, offset, len)?;
+    }
+
+    // madvise only unmaps the pages from this process, posix_fadvise is what actually lets the kernel
+    // drop them from the page cache (it is a no-op for pages still mapped by other processes)
+    #[cfg(target_os = "linux")]
+    {
+        let ret = unsafe {
+            libc::posix_fadvise(
+                file.as_raw_fd(),
+                offset as libc::off_t,
+                len as libc::off_t,
+                libc::POSIX_FADV_DONTNEED,
+            )
+        };
+        if ret != 0 {
+            return Err(std::io::Error::from_raw_os_error(ret));
+        }
+    }
+    #[cfg(not(target_os = "linux"))]
+    let _ = file;
+
+    Ok(())
+}
+
+#[cfg(not(unix))]
+fn advise_dontneed(_mmap: &Mmap, _file: &File, _offset: usize, _len: usize) -> std::io::Result<()> {
+    Ok(())
+}
+
 fn parse_binary_header(buf: &[u8]) -> Result<BinaryHeader, SegyError> {
     let byte_order = &buf[96..100];
     let byte_order: ByteOrder = match byte_order {
@@ -366,22 +1249,8 @@ fn parse_binary_header(buf: &[u8]) -> Result<BinaryHeader, SegyError> {
     // TODO: Look into bytes 3521, 3529, 3513 for additional useful data
     let extended_text_header_count = read_i16(buf, 304, &byte_order);
 
-    let bytes_per_sample: i16 = match data_format{
-        1 | 2 | 4 | 5 => 4,
-        3 => 2,
-        8 => 1,
-        _ => return Err(SegyError::UnsupportedDataFormat)
-    };
-
-    let data_format = match data_format{
-        1 => DataFormat::IBMf32,
-        2 => DataFormat::I32,
-        3 => DataFormat::I16,
-        4 => DataFormat::FixedPointWGain,
-        5 => DataFormat::IEEf32,
-        8 => DataFormat::I8,
-        _ => return Err(SegyError::UnsupportedDataFormat)
-    };
+    let data_format = DataFormat::from_code(data_format)?;
+    let bytes_per_sample = data_format.bytes_per_sample() as i16;
 
     Ok(BinaryHeader{
         sample_interval,
@@ -393,6 +1262,30 @@ fn parse_binary_header(buf: &[u8]) -> Result<BinaryHeader, SegyError> {
     })
 }
 
+// Sample count of the trace at trace_start, the binary header's count where the trace header has 0
+fn declared_samples(buf: &[u8], trace_start: usize, b_header: &BinaryHeader) -> i16 {
+    match read_i16(buf, trace_start + 114, &b_header.byte_order) {
+        0 => b_header.samples_per_trace,
+        n => n,
+    }
+}
+
+// Payload length in bytes of the trace at trace_start. A sample count that is not positive or runs
+// past the end of the file falls back to the binary header's fixed length, so one damaged trace header
+// doesn't hide the traces after it. None if neither length fits into the file.
+fn trace_payload_bytes(buf: &[u8], trace_start: usize, b_header: &BinaryHeader) -> Option<usize> {
+    let data_start = trace_start.checked_add(240)?;
+    let fits = |samples: i16| -> Option<usize> {
+        if samples <= 0 {
+            return None;
+        }
+        let bytes = (samples as usize).checked_mul(b_header.bytes_per_sample as usize)?;
+        (data_start.checked_add(bytes)? <= buf.len()).then_some(bytes)
+    };
+
+    fits(declared_samples(buf, trace_start, b_header)).or_else(|| fits(b_header.samples_per_trace))
+}
+
 fn read_i16(buf: &[u8], offset: usize, order: &ByteOrder) -> i16 {
     let bytes = [buf[offset], buf[offset + 1]];
     match order{
@@ -402,6 +1295,105 @@ fn read_i16(buf: &[u8], offset: usize, order: &ByteOrder) -> i16 {
     }
 }
 
+fn read_i32(buf: &[u8], offset: usize, order: &ByteOrder) -> i32 {
+    let bytes = [buf[offset], buf[offset + 1], buf[offset + 2], buf[offset + 3]];
+    match order{
+        ByteOrder::BigEndian => i32::from_be_bytes(bytes),
+        ByteOrder::LittleEndian => i32::from_le_bytes(bytes),
+        ByteOrder::SwappedWord => i32::from_be_bytes([bytes[1], bytes[0], bytes[3], bytes[2]]),
+    }
+}
+
+fn write_i16(buf: &mut [u8], offset: usize, value: i16, order: &ByteOrder) {
+    let bytes = match order{
+        ByteOrder::BigEndian => value.to_be_bytes(),
+        ByteOrder::LittleEndian => value.to_le_bytes(),
+        ByteOrder::SwappedWord => {
+            let b = value.to_be_bytes();
+            [b[1], b[0]]
+        },
+    };
+    buf[offset..offset + 2].copy_from_slice(&bytes);
+}
+
+fn write_i32(buf: &mut [u8], offset: usize, value: i32, order: &ByteOrder) {
+    let bytes = match order{
+        ByteOrder::BigEndian => value.to_be_bytes(),
+        ByteOrder::LittleEndian => value.to_le_bytes(),
+        ByteOrder::SwappedWord => {
+            let b = value.to_be_bytes();
+            [b[1], b[0], b[3], b[2]]
+        },
+    };
+    buf[offset..offset + 4].copy_from_slice(&bytes);
+}
+
+// (start, end, field width) spans of the Rev 1 integer header fields, everything else
+// (unassigned and optional bytes) is copied as is when the byte order changes
+const BINARY_HEADER_LAYOUT: &[(usize, usize, usize)] = &[(0, 12, 4), (12, 60, 2), (300, 306, 2)];
+const TRACE_HEADER_LAYOUT: &[(usize, usize, usize)] = &[
+    (0, 28, 4), (28, 36, 2), (36, 68, 4), (68, 72, 2), (72, 88, 4), (88, 180, 2),
+    (180, 200, 4), (200, 204, 2), (204, 208, 4), (208, 224, 2), (224, 228, 4), (228, 232, 2),
+];
+
+// Rewrites header fields of src into dst (same length, already holding a copy of src) in another byte order
+fn convert_header(
+    src: &[u8],
+    dst: &mut [u8],
+    layout: &[(usize, usize, usize)],
+    from: &ByteOrder,
+    to: &ByteOrder,
+) {
+    if from == to {
+        return;
+    }
+
+    for &(start, end, width) in layout {
+        for offset in (start..end).step_by(width) {
+            match width {
+                2 => write_i16(dst, offset, read_i16(src, offset, from), to),
+                _ => write_i32(dst, offset, read_i32(src, offset, from), to),
+            }
+        }
+    }
+}
+
+// Checks raw samples without decoding them, returns TRACE_* flags
+fn check_samples(raw_buf: &[u8], data_format: &DataFormat, byte_order: &ByteOrder) -> u8 {
+    let mut flags = TRACE_OK;
+
+    match data_format {
+        DataFormat::IEEf32 => {
+            for b in raw_buf.chunks_exact(4) {
+                let word = read_i32(b, 0, byte_order) as u32;
+                let exponent = (word >> 23) & 0xFF;
+                let mantissa = word & 0x007F_FFFF;
+
+                if exponent == 0xFF {
+                    flags |= TRACE_NON_FINITE;
+                } else if exponent == 0 && mantissa != 0 {
+                    flags |= TRACE_DENORMAL;
+                }
+            }
+        },
+        DataFormat::IBMf32 => {
+            // IBM floats span roughly 16^-65..16^63, so values with extreme exponents decode to
+            // f32 infinities, denormals or zeros
+            for b in raw_buf.chunks_exact(4) {
+                let value = ibmf32_from_be([b[0], b[1], b[2], b[3]], byte_order);
+                let has_mantissa = read_i32(b, 0, byte_order) & 0x00FF_FFFF != 0;
+
+                if has_mantissa && !value.is_normal() {
+                    flags |= TRACE_IBM_EXPONENT;
+                }
+            }
+        },
+        _ => {},
+    }
+
+    flags
+}
+
 fn ibmf32_from_be(bytes: [u8; 4], byte_order: &ByteOrder) -> f32{
     // IBMf32 -> 1 sign bit, 7 exponent bits, 24 mantissa bits
     // unlike IEEE754, IBM 32-bit float uses base 16 exponent
@@ -423,6 +1415,54 @@ fn ibmf32_from_be(bytes: [u8; 4], byte_order: &ByteOrder) -> f32{
 }
 
 
+fn ibmf32_word(value: f32) -> u32 {
+    // IEEE754 -> IBMf32, rounded to nearest with ties to even. NaN has no IBM counterpart and becomes 0,
+    // infinities saturate to the largest IBM magnitude
+    let bits = value.to_bits();
+    let sign = bits & 0x8000_0000;
+    let mut exponent = ((bits >> 23) & 0xFF) as i32;
+    let mut mantissa = bits & 0x007F_FFFF;
+
+    if exponent == 0xFF {
+        return if mantissa != 0 { 0 } else { sign | 0x7FFF_FFFF };
+    }
+    if exponent == 0 {
+        if mantissa == 0 {
+            return sign;
+        }
+        // Denormals are normalized, IBM floats reach far below the f32 range
+        exponent = 1;
+        while mantissa & 0x0080_0000 == 0 {
+            mantissa <<= 1;
+            exponent -= 1;
+        }
+    } else {
+        mantissa |= 0x0080_0000;
+    }
+
+    // |value| = mantissa / 2^24 * 2^e with mantissa / 2^24 in [0.5, 1).
+    // IBM needs a power of 16, so the mantissa is shifted right until e is a multiple of 4
+    let e = exponent - 126;
+    let shift = (4 - e.rem_euclid(4)) % 4;
+    let mut exponent = (e + shift) / 4 + 64;
+
+    if shift > 0 {
+        let rest = mantissa & ((1 << shift) - 1);
+        let half = 1 << (shift - 1);
+        mantissa >>= shift;
+        if rest > half || (rest == half && mantissa & 1 == 1) {
+            mantissa += 1;
+        }
+    }
+    if mantissa > 0x00FF_FFFF {
+        mantissa >>= 4;
+        exponent += 1;
+    }
+
+    // Every finite f32 (denormals included) lies well inside 16^-65..16^63, no exponent clamping needed
+    sign | (exponent as u32) << 24 | mantissa
+}
+
 fn ieef32_from_order(bytes: [u8; 4], byte_order: &ByteOrder) -> f32 {
     let bits = match byte_order {
         ByteOrder::LittleEndian => u32::from_le_bytes(bytes),
@@ -488,14 +1528,392 @@ fn decode_i32_trace(data: &[u8], byte_order: &ByteOrder) -> TraceData {
     TraceData::I32(traces)
 }
 
+// Histogram bins follow the f32 bit layout of |amplitude|: 8 exponent bits and the top mantissa bits.
+// This gives fixed, logarithmically spaced bins (1/16 of an octave wide) over the whole finite f32 range,
+// so the histogram can be filled in a single pass without knowing the amplitude range up front.
+const HISTOGRAM_MANTISSA_BITS: u32 = 4;
+const HISTOGRAM_SHIFT: u32 = 23 - HISTOGRAM_MANTISSA_BITS;
+const HISTOGRAM_BINS: usize = 255 << HISTOGRAM_MANTISSA_BITS;
+
+#[derive(Debug, Clone)]
+struct AmplitudeStats{
+    count: u64,
+    non_finite: u64,
+    traces_scanned: u64,
+    min: f64,
+    max: f64,
+    sum: f64,
+    sum_sq: f64,
+    histogram: Vec<u64>,
+}
+
+impl AmplitudeStats {
+    fn new() -> Self {
+        Self{
+            count: 0,
+            non_finite: 0,
+            traces_scanned: 0,
+            min: f64::INFINITY,
+            max: f64::NEG_INFINITY,
+            sum: 0.0,
+            sum_sq: 0.0,
+            histogram: vec![0; HISTOGRAM_BINS],
+        }
+    }
+
+    fn add_trace(&mut self, trace: &TraceData) {
+        match trace {
+            TraceData::F32(v) => v.iter().for_each(|&x| self.add(x as f64)),
+            TraceData::I16(v) => v.iter().for_each(|&x| self.add(x as f64)),
+            TraceData::I32(v) => v.iter().for_each(|&x| self.add(x as f64)),
+            TraceData::I8(v) => v.iter().for_each(|&x| self.add(x as f64)),
+        }
+        self.traces_scanned += 1;
+    }
+
+    fn add(&mut self, value: f64) {
+        if !value.is_finite() {
+            self.non_finite += 1;
+            return;
+        }
+
+        self.count += 1;
+        self.min = self.min.min(value);
+        self.max = self.max.max(value);
+        self.sum += value;
+        self.sum_sq += value * value;
+
+        let bin = ((value.abs() as f32).to_bits() >> HISTOGRAM_SHIFT) as usize;
+        self.histogram[bin.min(HISTOGRAM_BINS - 1)] += 1;
+    }
+
+    fn merge(mut self, other: Self) -> Self {
+        self.count += other.count;
+        self.non_finite += other.non_finite;
+        self.traces_scanned += other.traces_scanned;
+        self.min = self.min.min(other.min);
+        self.max = self.max.max(other.max);
+        self.sum += other.sum;
+        self.sum_sq += other.sum_sq;
+        self.histogram.iter_mut().zip(other.histogram).for_each(|(a, b)| *a += b);
+
+        self
+    }
+
+    fn mean(&self) -> f64 {
+        if self.count == 0 { f64::NAN } else { self.sum / self.count as f64 }
+    }
+
+    fn rms(&self) -> f64 {
+        if self.count == 0 { f64::NAN } else { (self.sum_sq / self.count as f64).sqrt() }
+    }
+
+    fn bin_edge(bin: usize) -> f32 {
+        f32::from_bits((bin as u32) << HISTOGRAM_SHIFT)
+    }
+
+    // Edges of |amplitude| bins, HISTOGRAM_BINS + 1 values, the last one being +inf
+    fn bin_edges() -> Vec<f32> {
+        (0..=HISTOGRAM_BINS).map(Self::bin_edge).collect()
+    }
+
+    // p-th percentile (0..100) of |amplitude|, interpolated linearly inside the matching bin
+    fn percentile(&self, p: f64) -> f64 {
+        if self.count == 0 {
+            return f64::NAN;
+        }
+
+        let rank = p / 100.0 * self.count as f64;
+        let mut seen = 0.0;
+
+        for (bin, &n) in self.histogram.iter().enumerate() {
+            if n == 0 {
+                continue;
+            }
+
+            if seen + n as f64 >= rank {
+                let low = Self::bin_edge(bin) as f64;
+                let high = (Self::bin_edge(bin + 1) as f64).min(self.min.abs().max(self.max.abs()));
+                let fraction = (rank - seen) / n as f64;
+                return low + (high - low).max(0.0) * fraction;
+            }
+            seen += n as f64;
+        }
+
+        self.min.abs().max(self.max.abs())
+    }
+}
+
+// Size of the blocks the background reader thread hands over and how many of them may wait in the queue
+const STREAM_BLOCK_BYTES: usize = 8 * 1024 * 1024;
+const STREAM_QUEUE_BLOCKS: usize = 4;
+
+// Reads from a Python file-like object (anything with .read(n) returning bytes)
+struct PyFileReader{
+    obj: Py<PyAny>,
+}
+
+impl Read for PyFileReader {
+    fn read(&mut self, buf: &mut [u8]) -> std::io::Result<usize> {
+        Python::attach(|py| {
+            let data = self.obj.bind(py).call_method1("read", (buf.len(),))?;
+            let data = data.downcast::<PyBytes>()?.as_bytes();
+            let n = data.len().min(buf.len());
+            buf[..n].copy_from_slice(&data[..n]);
+            Ok::<usize, PyErr>(n)
+        }).map_err(std::io::Error::other)
+    }
+}
+
+// Receiving end of the background reader thread, see spawn_stream_reader
+struct ChannelReader{
+    rx: Receiver<std::io::Result<Vec<u8>>>,
+    block: Vec<u8>,
+    pos: usize,
+}
+
+impl Read for ChannelReader {
+    fn read(&mut self, buf: &mut [u8]) -> std::io::Result<usize> {
+        if self.pos == self.block.len() {
+            match self.rx.recv() {
+                Ok(block) => {
+                    self.block = block?;
+                    self.pos = 0;
+                },
+                // Sender is gone - source is exhausted
+                Err(_) => return Ok(0),
+            }
+        }
+
+        let n = (self.block.len() - self.pos).min(buf.len());
+        buf[..n].copy_from_slice(&self.block[self.pos..self.pos + n]);
+        self.pos += n;
+
+        Ok(n)
+    }
+}
+
+// Reads the source (decompressing it if it starts with the gzip magic) on a background thread
+// in large blocks, so reading and decompression overlap with decoding on the caller's side
+fn spawn_stream_reader<R: Read + Send + 'static>(source: R) -> ChannelReader {
+    let (tx, rx) = sync_channel(STREAM_QUEUE_BLOCKS);
+
+    std::thread::spawn(move || {
+        let mut source = BufReader::with_capacity(STREAM_BLOCK_BYTES, source);
+        let is_gzip = matches!(source.fill_buf(), Ok(head) if head.starts_with(&[0x1f, 0x8b]));
+        let mut reader: Box<dyn Read> = if is_gzip {
+            Box::new(MultiGzDecoder::new(source))
+        } else {
+            Box::new(source)
+        };
+
+        loop {
+            let mut block = vec![0u8; STREAM_BLOCK_BYTES];
+            match read_full(&mut reader, &mut block) {
+                Ok(0) => break,
+                Ok(n) => {
+                    block.truncate(n);
+                    // Receiver dropped - the stream was closed before reaching the end
+                    if tx.send(Ok(block)).is_err() {
+                        break;
+                    }
+                },
+                Err(e) => {
+                    let _ = tx.send(Err(e));
+                    break;
+                },
+            }
+        }
+    });
+
+    ChannelReader{rx, block: Vec::new(), pos: 0}
+}
+
+// Like Read::read_exact, but returns the number of bytes read when the source ends early
+fn read_full(reader: &mut impl Read, buf: &mut [u8]) -> std::io::Result<usize> {
+    let mut filled = 0;
+
+    while filled < buf.len() {
+        match reader.read(&mut buf[filled..]) {
+            Ok(0) => break,
+            Ok(n) => filled += n,
+            Err(e) if e.kind() == std::io::ErrorKind::Interrupted => continue,
+            Err(e) => return Err(e),
+        }
+    }
+
+    Ok(filled)
+}
+
+struct StreamState{
+    reader: ChannelReader,
+    finished: bool,
+    // Error hit after a partial chunk was already decoded, raised by the next call
+    error: Option<SegyError>,
+}
+
+// Forward-only SEG-Y reader for sources that cannot be memory mapped: pipes, Python file-like
+// objects and gzip compressed files
+#[pyclass]
+struct SegyStream{
+    b_header: BinaryHeader,
+    text_header: Vec<u8>,
+    chunk_traces: usize,
+    // Kept outside of state, get_metadata must not wait for a chunk being read with the GIL released
+    traces_read: AtomicU64,
+    state: Mutex<StreamState>,
+}
+
+#[pymethods]
+impl SegyStream {
+    /// source is a path (plain or gzip compressed) or a binary file-like object, e.g. sys.stdin.buffer.
+    /// Iterating yields (trace_headers [traces, 240] uint8, data [traces, samples]) chunks.
+    #[new]
+    #[pyo3(signature = (source, chunk_traces=1000))]
+    fn new(py: Python<'_>, source: &Bound<'_, PyAny>, chunk_traces: usize) -> PyResult<Self> {
+        if chunk_traces == 0 {
+            return Err(PyValueError::new_err("chunk_traces must be > 0"));
+        }
+
+        let mut reader = if source.hasattr("read")? {
+            spawn_stream_reader(PyFileReader{obj: source.clone().unbind()})
+        } else {
+            let path: std::path::PathBuf = source.extract()?;
+            spawn_stream_reader(File::open(path)?)
+        };
+
+        let mut headers = vec![0u8; 3600];
+        let read = py.detach(|| read_full(&mut reader, &mut headers))?;
+        if read < 3600 {
+            return Err(PyIOError::new_err("Failed to open stream: source ends before the binary header"));
+        }
+
+        let b_header = parse_binary_header(&headers[3200..3600])
+            .map_err(|e| PyIOError::new_err(format!("Failed to open stream: {}", e)))?;
+
+        // Extended textual headers are not exposed, they only need to be skipped
+        let mut extended = vec![0u8; b_header.extended_text_header_count.max(0) as usize * 3200];
+        let read = py.detach(|| read_full(&mut reader, &mut extended))?;
+        if read < extended.len() {
+            return Err(PyIOError::new_err("Failed to open stream: source ends inside the extended textual headers"));
+        }
+
+        headers.truncate(3200);
+
+        Ok(Self{
+            b_header,
+            text_header: headers,
+            chunk_traces,
+            traces_read: AtomicU64::new(0),
+            state: Mutex::new(StreamState{reader, finished: false, error: None}),
+        })
+    }
+
+    fn get_metadata<'py>(&self, py: Python<'py>) -> PyResult<Bound<'py, PyDict>> {
+        let dict = binary_header_to_dict(py, &self.b_header)?;
+        dict.set_item("Traces Read", self.traces_read.load(Ordering::Relaxed))?;
+
+        Ok(dict)
+    }
+
+    fn get_header<'py>(&self, py: Python<'py>) -> PyResult<Bound<'py, PyString>> {
+        let s = decode_text_header(&self.text_header)?;
+
+        Ok(PyString::new(py, &s))
+    }
+
+    fn __iter__(slf: PyRef<'_, Self>) -> PyRef<'_, Self> {
+        slf
+    }
+
+    fn __next__<'py>(&self, py: Python<'py>) -> PyResult<Option<(Bound<'py, PyAny>, Bound<'py, PyAny>)>> {
+        // The GIL must be released while waiting, the reader thread may need it to read a Python file-like object
+        let (headers, traces) = py.detach(|| self.read_chunk())
+            .map_err(|e| PyIOError::new_err(e.to_string()))?;
+
+        if traces.is_empty() {
+            return Ok(None);
+        }
+
+        let headers = Array2::from_shape_vec((traces.len(), 240), headers)
+            .map_err(|e| PyTypeError::new_err(e.to_string()))?;
+
+        Ok(Some((headers.into_pyarray(py).into_any(), traces_to_numpy2(py, traces)?)))
+    }
+}
+
+impl SegyStream {
+    // Reads up to chunk_traces traces, returns their headers (240 bytes each) and decoded samples.
+    // An error after some traces were decoded returns those first and is raised by the next call.
+    fn read_chunk(&self) -> Result<(Vec<u8>, Vec<TraceData>), SegyError> {
+        let mut state = self.state.lock().unwrap();
+        if let Some(e) = state.error.take() {
+            return Err(e);
+        }
+
+        let mut headers: Vec<u8> = Vec::with_capacity(self.chunk_traces * 240);
+        let mut traces: Vec<TraceData> = Vec::with_capacity(self.chunk_traces);
+        let mut payload: Vec<u8> = Vec::new();
+
+        while !state.finished && traces.len() < self.chunk_traces {
+            match self.read_trace(&mut state.reader, &mut payload) {
+                Ok(Some((header, trace))) => {
+                    headers.extend_from_slice(&header);
+                    traces.push(trace);
+                    self.traces_read.fetch_add(1, Ordering::Relaxed);
+                },
+                Ok(None) => state.finished = true,
+                Err(e) => {
+                    // The position in the source is lost after a damaged trace, nothing after it can be read
+                    state.finished = true;
+                    if traces.is_empty() {
+                        return Err(e);
+                    }
+                    state.error = Some(e);
+                },
+            }
+        }
+
+        Ok((headers, traces))
+    }
+
+    // Reads the next trace header and samples, None at the end of the source
+    fn read_trace(&self, reader: &mut ChannelReader, payload: &mut Vec<u8>) -> Result<Option<([u8; 240], TraceData)>, SegyError> {
+        let b_header = &self.b_header;
+        let trace_number = self.traces_read.load(Ordering::Relaxed) as usize + 1;
+        let mut header = [0u8; 240];
+
+        match read_full(reader, &mut header)? {
+            0 => return Ok(None),
+            240 => {},
+            _ => return Err(SegyError::CorruptTrace(trace_number)),
+        }
+
+        let samples = declared_samples(&header, 0, b_header);
+        if samples <= 0 {
+            return Err(SegyError::CorruptTrace(trace_number));
+        }
+
+        payload.resize(samples as usize * b_header.bytes_per_sample as usize, 0);
+        if read_full(reader, payload)? < payload.len() {
+            return Err(SegyError::CorruptTrace(trace_number));
+        }
+
+        let trace = SegyFile::decode_trace(b_header, &b_header.byte_order, payload)?;
+        Ok(Some((header, trace)))
+    }
+}
+
 #[derive(Debug)]
 pub enum SegyError {
     Io(std::io::Error),
     TraceOutOfRange { requested: u32, trace_count: usize },
     InvalidTraceRange {start: u32, end: u32, trace_count: usize},
     UnsupportedDataFormat,
-    CorruptTrace,
+    CorruptTrace(usize),
     ParseFailure,
+    InvalidAccessPattern(String),
+    UnknownHeaderField(String),
 }
 
 impl From<std::io::Error> for SegyError {
@@ -515,8 +1933,14 @@ impl Display for SegyError {
                 format!("Invalid trace range. ({start} to {end} in file with {trace_count} traces)")
             },
             SegyError::UnsupportedDataFormat => String::from("Unsupported data format"),
-            SegyError::CorruptTrace => String::from("Corrupt trace segment"),
+            SegyError::CorruptTrace(trace_number) => format!("Corrupt trace segment (trace {trace_number})"),
             SegyError::ParseFailure => String::from("Failed to parse data"),
+            SegyError::InvalidAccessPattern(access) => {
+                format!("Invalid access pattern '{access}'. Expected one of: normal, sequential, random, willneed")
+            },
+            SegyError::UnknownHeaderField(field) => {
+                format!("Unknown trace header field '{field}'. Use a field name or a 1-based byte position")
+            },
         };
         write!(f, "{:?}", result)
     }
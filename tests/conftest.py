@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+
+SAMPLE_DTYPES = {1: "u4", 2: "i4", 3: "i2", 5: "f4", 8: "i1"}
+
+
+def ibm_words(values):
+    """Encodes float values as IBM 32-bit floats, returns the raw words as uint32."""
+    values = np.asarray(values, dtype=np.float64)
+    magnitude = np.abs(values)
+    nonzero = magnitude > 0
+
+    # |value| = mantissa / 2^24 * 16^(exponent - 64), with 1/16 <= mantissa / 2^24 < 1
+    exponent = np.zeros(values.shape, dtype=np.int64)
+    exponent[nonzero] = np.floor(np.log2(magnitude[nonzero]) / 4).astype(np.int64) + 1
+    mantissa = np.zeros(values.shape, dtype=np.int64)
+    mantissa[nonzero] = np.round(magnitude[nonzero] / 16.0 ** exponent[nonzero] * 2 ** 24).astype(np.int64)
+
+    overflow = mantissa >= 2 ** 24
+    mantissa[overflow] >>= 4
+    exponent[overflow] += 1
+
+    words = (np.signbit(values).astype(np.uint32) << 31) | mantissa.astype(np.uint32)
+    words[nonzero] |= (exponent[nonzero] + 64).astype(np.uint32) << 24
+    return words
+
+
+@pytest.fixture
+def write_segy(tmp_path):
+    """
+    Factory writing a small Rev 1 SEG-Y file into tmp_path and returning its path.
+
+    data: np.ndarray [traces, samples] - sample values, IBM (format 1) values are encoded from floats
+    format: int - SEG-Y data format code
+    byte_order: str - "big" or "little"
+    headers: dict - 1-based byte position of a 4-byte trace header field -> value per trace
+    sample_counts: list - per-trace sample count written to byte 115 instead of the real one
+    tail: bytes - appended after the last trace
+    """
+
+    def write(data, name="test.sgy", format=5, byte_order="big", sample_interval=4000,
+              headers=None, sample_counts=None, tail=b""):
+        data = np.asarray(data)
+        n_traces, n_samples = data.shape
+        endian = ">" if byte_order == "big" else "<"
+
+        text = "".join(f"C{i + 1:2d} FASTSEGY TEST FILE".ljust(80) for i in range(40))
+
+        binary = np.zeros(400, dtype=np.uint8)
+        fields_i16 = {16: sample_interval, 20: n_samples, 24: format, 300: 0x0100, 302: 1}
+        for offset, value in fields_i16.items():
+            binary[offset:offset + 2] = np.frombuffer(np.array(value, dtype=endian + "i2").tobytes(), np.uint8)
+        binary[96:100] = np.frombuffer(np.array(0x01020304, dtype=endian + "i4").tobytes(), np.uint8)
+
+        trace_headers = np.zeros((n_traces, 240), dtype=np.uint8)
+        fields_i32 = {1: np.arange(1, n_traces + 1), 5: np.arange(1, n_traces + 1)}
+        fields_i32.update(headers or {})
+        for byte, values in fields_i32.items():
+            values = np.ascontiguousarray(np.broadcast_to(values, (n_traces,)), dtype=endian + "i4")
+            trace_headers[:, byte - 1:byte + 3] = values.view(np.uint8).reshape(n_traces, 4)
+
+        counts = np.full(n_traces, n_samples) if sample_counts is None else np.asarray(sample_counts)
+        for byte, values in ((115, counts), (117, np.full(n_traces, sample_interval))):
+            values = np.asarray(values, dtype=endian + "i2")
+            trace_headers[:, byte - 1:byte + 1] = values.view(np.uint8).reshape(n_traces, 2)
+
+        if format == 1:
+            data = ibm_words(data)
+        samples = data.astype(endian + SAMPLE_DTYPES[format]).view(np.uint8).reshape(n_traces, -1)
+
+        path = tmp_path / name
+        with open(path, "wb") as f:
+            f.write(text.encode("ascii"))
+            f.write(binary.tobytes())
+            f.write(np.hstack([trace_headers, samples]).tobytes())
+            f.write(tail)
+
+        return str(path)
+
+    return write
@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+from fastsegy import SegyFile
+
+
+@pytest.mark.parametrize("access", ["normal", "sequential", "random", "willneed"])
+def test_access_patterns(write_segy, access):
+    data = np.random.default_rng(0).standard_normal((6, 20)).astype(np.float32)
+    path = write_segy(data)
+
+    segy = SegyFile(path, access=access, populate=access == "willneed")
+
+    assert segy.access == access
+    np.testing.assert_array_equal(segy.get_trace_range(1, 6), data)
+
+
+def test_invalid_access_pattern(write_segy):
+    path = write_segy(np.ones((2, 10), dtype=np.float32))
+
+    with pytest.raises(ValueError):
+        SegyFile(path, access="backwards")
+
+
+def test_prefetch_and_evict_keep_data(write_segy):
+    data = np.random.default_rng(1).standard_normal((8, 30)).astype(np.float32)
+    segy = SegyFile(write_segy(data))
+
+    segy.prefetch(1, 8)
+    segy.evict(2, 5)
+    segy.evict(8, 8)
+
+    np.testing.assert_array_equal(segy.get_trace_range(1, 8), data)
+
+
+@pytest.mark.parametrize("start, end", [(0, 3), (4, 2), (1, 9)])
+def test_prefetch_and_evict_invalid_range(write_segy, start, end):
+    segy = SegyFile(write_segy(np.ones((8, 10), dtype=np.float32)))
+
+    with pytest.raises(TypeError):
+        segy.prefetch(start, end)
+    with pytest.raises(TypeError):
+        segy.evict(start, end)
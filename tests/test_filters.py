@@ -1,7 +1,7 @@
 import numpy as np
 import pytest
 
-from fastsegy.processing import running_average, median_xy_filter
+from fastsegy.processing import running_average, median_xy_filter, agc, bandpass
 
 
 def test_running_average_basic():
@@ -87,3 +87,88 @@ def test_xy_median_edges():
 
     assert out.shape == data.shape
     assert not np.isnan(out).any()
+
+
+def test_agc_constant_amplitude():
+    data = np.full((100, 300), 7.0)
+    data[:, ::2] *= -1
+
+    out = agc({"window": 0.01}, data, sample_interval=1000)
+
+    np.testing.assert_allclose(np.abs(out), 1.0)
+    assert np.all(np.sign(out) == np.sign(data))
+
+
+def test_agc_zero_traces_stay_zero():
+    data = np.zeros((50, 4), dtype=np.float32)
+
+    out = agc({"window": 0.01}, data, sample_interval=1000)
+
+    assert out.dtype == np.float32
+    assert not out.any()
+
+
+def test_agc_invalid_window():
+    data = np.ones((10, 5))
+
+    with pytest.raises(ValueError):
+        agc({"window": 1.0}, data, sample_interval=1000)
+
+
+def test_bandpass_keeps_passband_removes_stopband():
+    sample_interval = 1000
+    t = np.arange(1000) * sample_interval / 1e6
+    signal = np.sin(2 * np.pi * 30 * t)
+    noise = np.sin(2 * np.pi * 200 * t)
+    data = np.tile((signal + noise)[:, None], (1, 3))
+
+    out = bandpass({"low": 10, "high": 60, "taper": 5}, data, sample_interval)
+
+    assert out.shape == data.shape
+    np.testing.assert_allclose(out[100:-100, 1], signal[100:-100], atol=0.05)
+
+
+def test_bandpass_invalid_corners():
+    data = np.ones((10, 5))
+
+    with pytest.raises(ValueError):
+        bandpass({"low": 60, "high": 10}, data, sample_interval=1000)
+
+    with pytest.raises(ValueError):
+        bandpass({"low": 10, "high": 600}, data, sample_interval=1000)
+
+
+def test_filters_write_into_out():
+    data = np.random.randn(30, 8)
+    expected = median_xy_filter({"x": 3, "y": 3, "start_time": 0.005, "end_time": 0.02}, data, 1000)
+
+    out = data.copy()
+    result = median_xy_filter({"x": 3, "y": 3, "start_time": 0.005, "end_time": 0.02}, out, 1000, out=out)
+
+    assert result is out
+    np.testing.assert_array_equal(out, expected)
+
+
+def test_agc_out_must_be_float():
+    data = np.ones((10, 5), dtype=np.int16)
+
+    with pytest.raises(ValueError):
+        agc({"window": 0.003}, data, 1000, out=data)
+
+
+@pytest.mark.parametrize("transformation, params", [
+    (running_average, {"range": 3, "start_time": 0.01, "end_time": 0.03}),
+    (median_xy_filter, {"x": 3, "y": 3, "start_time": "", "end_time": ""}),
+    (agc, {"window": 0.01}),
+    (bandpass, {"low": 10, "high": 60}),
+])
+def test_filters_report_progress(transformation, params):
+    data = np.random.randn(100, 600)
+    reports = []
+
+    expected = transformation(params, data, 1000)
+    out = transformation(params, data, 1000, progress=lambda done, total: reports.append((done, total)))
+
+    np.testing.assert_allclose(out, expected)
+    assert reports and reports[-1][0] == reports[-1][1]
+    assert [done for done, _ in reports] == list(range(1, len(reports) + 1))
@@ -0,0 +1,108 @@
+import numpy as np
+import pytest
+
+from fastsegy.history import ProcessingHistory
+from fastsegy.processing import profile_flip, running_average, median_xy_filter
+
+
+def make_section():
+    rng = np.random.default_rng(0)
+    return rng.standard_normal((40, 12))
+
+
+def test_apply_is_in_place_and_undo_restores():
+    data = make_section()
+    original = data.copy()
+    history = ProcessingHistory(data, sample_interval=1000)
+
+    history.apply(median_xy_filter, {"x": 3, "y": 3, "start_time": 0.01, "end_time": 0.02})
+
+    assert history.data is data
+    assert not np.allclose(history.data, original)
+
+    history.undo()
+
+    np.testing.assert_array_equal(history.data, original)
+    assert not history.can_undo and history.can_redo
+
+
+def test_redo_matches_apply():
+    data = make_section()
+    history = ProcessingHistory(data, sample_interval=1000)
+
+    history.apply(running_average, {"range": 3, "start_time": 0, "end_time": ""})
+    history.apply(profile_flip, {"axis": "x"})
+    expected = history.data.copy()
+
+    history.undo()
+    history.undo()
+    history.redo()
+    history.redo()
+
+    np.testing.assert_array_equal(history.data, expected)
+
+
+def test_windowed_step_stores_only_its_band():
+    data = make_section()
+    history = ProcessingHistory(data, sample_interval=1000)
+
+    history.apply(median_xy_filter, {"x": 3, "y": 3, "start_time": 0.01, "end_time": 0.019})
+
+    assert history.stored_bytes == 10 * 12 * data.itemsize
+
+
+def test_undo_over_budget_replays_from_checkpoint():
+    data = make_section()
+    original = data.copy()
+    history = ProcessingHistory(data, sample_interval=1000, max_bytes=0)
+
+    history.apply(profile_flip, {"axis": "y"})
+    history.apply(median_xy_filter, {"x": 3, "y": 3, "start_time": 0, "end_time": ""})
+    after_flip = np.flipud(original)
+
+    assert history.stored_bytes == 0
+
+    history.undo()
+    np.testing.assert_array_equal(history.data, after_flip)
+
+    history.undo()
+    np.testing.assert_array_equal(history.data, original)
+
+
+def test_failed_step_leaves_section_unchanged():
+    data = make_section()
+    original = data.copy()
+    history = ProcessingHistory(data, sample_interval=1000)
+
+    def broken(params, data, sample_interval, out=None):
+        out[:5] = 0
+        raise ValueError("broken")
+
+    with pytest.raises(ValueError):
+        history.apply(broken, {})
+
+    np.testing.assert_array_equal(history.data, original)
+    assert not history.can_undo
+
+
+def test_integer_section_converted_to_float():
+    data = np.arange(20, dtype=np.int16).reshape(5, 4)
+    history = ProcessingHistory(data, sample_interval=1000)
+
+    assert history.data.dtype == np.float32
+
+
+def test_stopped_step_leaves_section_unchanged():
+    data = np.random.default_rng(1).standard_normal((40, 600))
+    original = data.copy()
+    history = ProcessingHistory(data, sample_interval=1000)
+
+    def stop(done, total):
+        if done == 2:
+            raise RuntimeError("stopped")
+
+    with pytest.raises(RuntimeError):
+        history.apply(median_xy_filter, {"x": 3, "y": 3, "start_time": "", "end_time": ""}, progress=stop)
+
+    np.testing.assert_array_equal(history.data, original)
+    assert not history.can_undo
@@ -0,0 +1,71 @@
+import os
+
+import numpy as np
+import pytest
+
+from fastsegy import SegyFile
+
+CDPS = np.array([7, 5, 7, 6, 5, 7])
+
+
+def make_file(write_segy, cdps=CDPS):
+    data = np.arange(len(cdps) * 8, dtype=np.float32).reshape(len(cdps), 8)
+    return write_segy(data, headers={21: cdps}), data
+
+
+def test_get_gather_keeps_file_order(write_segy):
+    path, data = make_file(write_segy)
+    segy = SegyFile(path)
+
+    np.testing.assert_array_equal(segy.get_gather("cdp", 7), data[[0, 2, 5]])
+    np.testing.assert_array_equal(segy.get_gather("cdp", 7), segy.get_trace_range(1, 6)[[0, 2, 5]])
+
+
+def test_get_gather_range_orders_by_value(write_segy):
+    path, data = make_file(write_segy)
+    segy = SegyFile(path)
+
+    np.testing.assert_array_equal(segy.get_gather_range("cdp", 5, 6), data[[1, 4, 3]])
+    np.testing.assert_array_equal(segy.find_traces("cdp", 5, 6), [2, 5, 4])
+    np.testing.assert_array_equal(segy.find_traces(21, 5, 6), segy.find_traces("cdp", 5, 6))
+
+
+def test_get_gather_missing_value(write_segy):
+    path, _ = make_file(write_segy)
+    segy = SegyFile(path)
+
+    assert len(segy.find_traces("cdp", 100)) == 0
+    with pytest.raises(ValueError):
+        segy.get_gather("cdp", 100)
+
+
+def test_persisted_index_is_loaded_after_reopen(write_segy):
+    path, _ = make_file(write_segy)
+    SegyFile(path).build_index("cdp", persist=True)
+
+    # Shift the saved keys, a reopened file that really loads the index sees the shifted values
+    index_path = f"{path}.cdp.idx"
+    raw = bytearray(open(index_path, "rb").read())
+    keys = np.frombuffer(raw, dtype="<i4", count=len(CDPS), offset=48) + 100
+    raw[48:48 + keys.nbytes] = keys.astype("<i4").tobytes()
+    with open(index_path, "wb") as f:
+        f.write(raw)
+
+    segy = SegyFile(path)
+
+    np.testing.assert_array_equal(segy.find_traces("cdp", 105, 107), [2, 5, 4, 1, 3, 6])
+    assert len(segy.find_traces("cdp", 5, 7)) == 0
+
+
+def test_stale_persisted_index_is_rebuilt(write_segy):
+    path, _ = make_file(write_segy)
+    SegyFile(path).build_index("cdp", persist=True)
+    modified = os.stat(path).st_mtime_ns
+
+    # Same size and trace count, only the modification time tells the versions apart
+    path, data = make_file(write_segy, cdps=CDPS[::-1])
+    os.utime(path, ns=(modified + 10**9, modified + 10**9))
+
+    segy = SegyFile(path)
+
+    np.testing.assert_array_equal(segy.get_gather("cdp", 6), data[[2]])
@@ -0,0 +1,95 @@
+import os
+import pickle
+
+import numpy as np
+import pytest
+
+from fastsegy import SegyFile
+from fastsegy.parallel import map_chunks
+
+
+class FakeSegyFile:
+    """Picklable stand-in exposing the part of SegyFile used by map_chunks."""
+
+    def __init__(self, trace_count, samples):
+        self.trace_count = trace_count
+        self.samples = samples
+
+    def get_trace(self, trace_number):
+        return np.full(self.samples, trace_number, dtype=np.float32)
+
+    def get_trace_range(self, start, end):
+        return np.stack([self.get_trace(t) for t in range(start, end + 1)])
+
+
+def first_trace_and_count(data):
+    return int(data[0, 0]), data.shape[0]
+
+
+def trace_sums(data):
+    return data.sum(axis=1)
+
+
+def test_map_chunks_ordered_results():
+    segy = FakeSegyFile(trace_count=23, samples=4)
+
+    results = list(map_chunks(segy, first_trace_and_count, chunk_traces=5, workers=2))
+
+    assert results == [(1, 5), (6, 5), (11, 5), (16, 5), (21, 3)]
+
+
+def test_map_chunks_single_trace_chunk():
+    segy = FakeSegyFile(trace_count=11, samples=4)
+
+    results = list(map_chunks(segy, first_trace_and_count, chunk_traces=5, workers=2))
+
+    assert results[-1] == (11, 1)
+
+
+def test_map_chunks_invalid_chunk_size():
+    with pytest.raises(ValueError):
+        map_chunks(FakeSegyFile(10, 4), first_trace_and_count, chunk_traces=0)
+
+
+@pytest.mark.parametrize("workers", [0, -1])
+def test_map_chunks_invalid_workers(workers):
+    with pytest.raises(ValueError):
+        map_chunks(FakeSegyFile(10, 4), first_trace_and_count, workers=workers)
+
+
+def test_segy_file_pickles_with_indexes(write_segy):
+    data = np.arange(6 * 10, dtype=np.float32).reshape(6, 10)
+    cdps = [3, 1, 3, 2, 1, 3]
+    path = write_segy(data, headers={21: cdps})
+
+    segy = SegyFile(path, access="sequential")
+    segy.build_index("cdp")
+    index = segy.get_metadata()["Index"]
+    restored = pickle.loads(pickle.dumps(segy))
+
+    assert restored.access == "sequential"
+    assert restored.trace_count == 6
+    np.testing.assert_array_equal(restored.get_trace_range(1, 6), segy.get_trace_range(1, 6))
+    np.testing.assert_array_equal(restored.get_gather("cdp", 3), data[[0, 2, 5]])
+
+    # Rewrite the file with other cdp values and a sample count that changes the trace layout,
+    # keeping size and modification time - only an unpickled index can still give the old answers
+    modified = os.stat(path).st_mtime_ns
+    blob = pickle.dumps(segy)
+    del segy, restored
+    write_segy(data, headers={21: [9] * 6}, sample_counts=[5, 10, 10, 10, 10, 10])
+    os.utime(path, ns=(modified, modified))
+
+    restored = pickle.loads(blob)
+
+    assert restored.get_metadata()["Index"] == index
+    np.testing.assert_array_equal(restored.find_traces("cdp", 3), [1, 3, 6])
+
+
+def test_map_chunks_segy_file(write_segy):
+    data = np.random.default_rng(0).standard_normal((23, 16)).astype(np.float32)
+    segy = SegyFile(write_segy(data))
+
+    results = np.concatenate(list(map_chunks(segy, trace_sums, chunk_traces=5, workers=2)))
+
+    np.testing.assert_allclose(results, data.sum(axis=1), rtol=1e-5)
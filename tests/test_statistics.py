@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+
+from fastsegy import SegyFile
+
+
+def make_file(write_segy):
+    data = np.random.default_rng(0).standard_normal((20, 100)).astype(np.float32)
+    data[1, 10] = np.nan
+    data[6, 20] = np.inf
+    return write_segy(data), data
+
+
+def test_statistics_whole_file(write_segy):
+    path, data = make_file(write_segy)
+
+    stats = SegyFile(path).compute_statistics()
+
+    finite = data[np.isfinite(data)].astype(np.float64)
+    assert stats["Traces Scanned"] == 20
+    assert stats["Count"] == finite.size
+    assert stats["Non Finite"] == 2
+    assert stats["Min"] == finite.min()
+    assert stats["Max"] == finite.max()
+    assert stats["Mean"] == pytest.approx(finite.mean())
+    assert stats["RMS"] == pytest.approx(np.sqrt(np.mean(finite ** 2)))
+
+
+def test_statistics_histogram(write_segy):
+    path, data = make_file(write_segy)
+
+    stats = SegyFile(path).compute_statistics()
+
+    histogram, edges = stats["Histogram"], stats["Bin Edges"]
+    assert len(edges) == len(histogram) + 1
+    assert histogram.sum() == stats["Count"]
+    np.testing.assert_array_equal(histogram, np.histogram(np.abs(data[np.isfinite(data)]), bins=edges)[0])
+
+
+def test_statistics_subsample(write_segy):
+    path, data = make_file(write_segy)
+
+    stats = SegyFile(path).compute_statistics(max_traces=5)
+
+    # Every fourth trace, one from each quarter of the file
+    scanned = data[[0, 4, 8, 12, 16]]
+    assert stats["Traces Scanned"] == 5
+    assert stats["Count"] == scanned.size
+    assert stats["Non Finite"] == 0
+    assert stats["Min"] == scanned.min()
+    assert stats["Max"] == scanned.max()
+
+
+def test_amplitude_percentile(write_segy):
+    path, data = make_file(write_segy)
+    segy = SegyFile(path)
+
+    amplitudes = np.abs(data[np.isfinite(data)])
+
+    # Histogram bins are 1/16 of an octave wide
+    assert segy.amplitude_percentile(50) == pytest.approx(np.percentile(amplitudes, 50), rel=0.05)
+    assert segy.amplitude_percentile(99) == pytest.approx(np.percentile(amplitudes, 99), rel=0.05)
+    assert segy.amplitude_percentile(100) == pytest.approx(amplitudes.max())
+    assert segy.amplitude_percentile(0) >= 0
+
+
+@pytest.mark.parametrize("p", [-1, 100.5])
+def test_amplitude_percentile_out_of_range(write_segy, p):
+    path, _ = make_file(write_segy)
+
+    with pytest.raises(ValueError):
+        SegyFile(path).amplitude_percentile(p)
@@ -0,0 +1,71 @@
+import gzip
+import io
+
+import numpy as np
+import pytest
+
+from fastsegy import SegyFile, SegyStream
+
+
+def make_file(write_segy):
+    data = np.random.default_rng(0).standard_normal((10, 24)).astype(np.float32)
+    return write_segy(data, headers={21: np.arange(10) + 100})
+
+
+def open_stream(path, source, tmp_path):
+    raw = open(path, "rb").read()
+
+    if source == "path":
+        return SegyStream(path, chunk_traces=4)
+    if source == "gzip path":
+        compressed = tmp_path / "stream.sgy.gz"
+        compressed.write_bytes(gzip.compress(raw))
+        return SegyStream(str(compressed), chunk_traces=4)
+    if source == "file":
+        return SegyStream(io.BytesIO(raw), chunk_traces=4)
+    return SegyStream(io.BytesIO(gzip.compress(raw)), chunk_traces=4)
+
+
+@pytest.mark.parametrize("source", ["path", "gzip path", "file", "gzip file"])
+def test_stream_matches_segy_file(write_segy, tmp_path, source):
+    path = make_file(write_segy)
+    segy = SegyFile(path)
+
+    stream = open_stream(path, source, tmp_path)
+    chunks = list(stream)
+
+    assert [len(data) for _, data in chunks] == [4, 4, 2]
+    np.testing.assert_array_equal(np.concatenate([data for _, data in chunks]), segy.get_trace_range(1, 10))
+
+    raw = np.fromfile(path, dtype=np.uint8)
+    expected_headers = np.stack([raw[offset:offset + 240] for offset in segy.get_metadata()["Index"]])
+    np.testing.assert_array_equal(np.concatenate([headers for headers, _ in chunks]), expected_headers)
+
+    assert stream.get_metadata()["Traces Read"] == 10
+    assert stream.get_header() == segy.get_header()
+
+
+def test_stream_returns_partial_chunk_before_error(write_segy):
+    path = write_segy(np.ones((7, 10), dtype=np.float32))
+    raw = open(path, "rb").read()
+
+    # Last trace is cut short
+    stream = SegyStream(io.BytesIO(raw[:-10]), chunk_traces=4)
+
+    assert len(next(stream)[1]) == 4
+    assert len(next(stream)[1]) == 2
+    with pytest.raises(OSError):
+        next(stream)
+    with pytest.raises(StopIteration):
+        next(stream)
+    assert stream.get_metadata()["Traces Read"] == 6
+
+
+def test_stream_negative_sample_count_raises(write_segy):
+    path = write_segy(np.ones((4, 10), dtype=np.float32), sample_counts=[10, -3, 10, 10])
+
+    stream = SegyStream(path, chunk_traces=4)
+
+    assert len(next(stream)[1]) == 1
+    with pytest.raises(OSError):
+        next(stream)
@@ -0,0 +1,88 @@
+import numpy as np
+import pytest
+
+from fastsegy import SegyFile, transcode
+
+
+def read_bytes(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def test_ibm_to_ieee_and_back(write_segy, tmp_path):
+    # Multiples of 1/8 are exact in both IBM and IEEE floats, so the round trip is lossless
+    data = np.random.default_rng(0).integers(-4000, 4000, (9, 40)) / 8
+    src = write_segy(data, format=1, byte_order="big", headers={21: np.arange(9) // 3})
+    ieee = str(tmp_path / "ieee.sgy")
+    back = str(tmp_path / "back.sgy")
+
+    assert transcode(src, ieee, format=5, byte_order="little") == 9
+
+    raw = read_bytes(ieee)
+    assert raw[3224:3226] == (5).to_bytes(2, "little")
+    assert raw[3296:3300] == bytes([4, 3, 2, 1])
+
+    segy = SegyFile(ieee)
+    metadata = segy.get_metadata()
+    assert metadata["Data Format"] == "IEEf32"
+    assert metadata["Byte Order"] == "Little Endian"
+    assert metadata["Sample Interval"] == 4000
+    np.testing.assert_array_equal(segy.get_trace_range(1, 9), SegyFile(src).get_trace_range(1, 9))
+    np.testing.assert_array_equal(segy.find_traces("cdp", 1), [4, 5, 6])
+
+    assert transcode(ieee, back, format=1, byte_order="big") == 9
+
+    raw = read_bytes(back)
+    assert raw[3224:3226] == (1).to_bytes(2, "big")
+    assert raw[3296:3300] == bytes([1, 2, 3, 4])
+    assert raw == read_bytes(src)
+
+
+def test_ieee_to_ibm(write_segy, tmp_path):
+    data = np.random.default_rng(1).standard_normal((5, 30)).astype(np.float32)
+    src = write_segy(data)
+    dst = str(tmp_path / "ibm.sgy")
+
+    transcode(src, dst, format=1)
+
+    # IBM floats keep 21 to 24 mantissa bits depending on the leading hex digit
+    np.testing.assert_allclose(SegyFile(dst).get_trace_range(1, 5), data, rtol=1e-6)
+
+
+def test_i16_byte_swap(write_segy, tmp_path):
+    data = np.random.default_rng(2).integers(-30000, 30000, (6, 25))
+    src = write_segy(data, format=3, byte_order="big")
+    dst = str(tmp_path / "swapped.sgy")
+
+    transcode(src, dst, format=3, byte_order="little")
+
+    raw = read_bytes(dst)
+    assert raw[3224:3226] == (3).to_bytes(2, "little")
+    assert raw[3296:3300] == bytes([4, 3, 2, 1])
+    assert len(raw) == len(read_bytes(src))
+
+    traces = SegyFile(dst).get_trace_range(1, 6)
+    assert traces.dtype == np.int16
+    np.testing.assert_array_equal(traces, SegyFile(src).get_trace_range(1, 6))
+
+
+@pytest.mark.parametrize("source_format, target_format", [(3, 2), (3, 8), (2, 3), (5, 3)])
+def test_integer_target_from_other_format_is_rejected(write_segy, tmp_path, source_format, target_format):
+    src = write_segy(np.ones((2, 10)), format=source_format)
+    dst = tmp_path / "out.sgy"
+
+    with pytest.raises(ValueError):
+        transcode(src, str(dst), format=target_format)
+    assert not dst.exists()
+
+
+def test_invalid_arguments(write_segy, tmp_path):
+    src = write_segy(np.ones((2, 10), dtype=np.float32))
+    dst = str(tmp_path / "out.sgy")
+
+    with pytest.raises(ValueError):
+        transcode(src, dst, format=4)
+    with pytest.raises(ValueError):
+        transcode(src, dst, byte_order="middle")
+    with pytest.raises(ValueError):
+        transcode(src, src, format=1)
@@ -0,0 +1,85 @@
+import numpy as np
+import pytest
+
+from fastsegy import (
+    SegyFile,
+    TRACE_OK,
+    TRACE_TRUNCATED,
+    TRACE_SAMPLE_COUNT,
+    TRACE_NON_FINITE,
+    TRACE_DENORMAL,
+    TRACE_IBM_EXPONENT,
+)
+
+
+def damaged_ieee_file(write_segy):
+    data = np.ones((6, 50), dtype=np.float32)
+    data[3, 3] = np.nan
+    data[3, 7] = 1e-40
+
+    # Negative and oversized sample counts, then a truncated trace at the end
+    path = write_segy(data, sample_counts=[50, -1, 30000, 50, 50, 50], tail=bytes(260))
+    return path, data
+
+
+def test_validate_flags_damaged_traces(write_segy):
+    path, _ = damaged_ieee_file(write_segy)
+
+    report = SegyFile(path).validate()
+
+    np.testing.assert_array_equal(report["Status"], [
+        TRACE_OK,
+        TRACE_SAMPLE_COUNT,
+        TRACE_SAMPLE_COUNT | TRACE_TRUNCATED,
+        TRACE_NON_FINITE | TRACE_DENORMAL,
+        TRACE_OK,
+        TRACE_OK,
+        TRACE_TRUNCATED,
+    ])
+    assert report["Traces"] == 7
+    assert report["OK"] == 3
+    assert report["Truncated"] == 2
+    assert report["Sample Count Mismatch"] == 2
+    assert report["Trailing Bytes"] == 260
+
+
+def test_damaged_sample_counts_fall_back_to_binary_header(write_segy):
+    path, data = damaged_ieee_file(write_segy)
+
+    segy = SegyFile(path)
+
+    assert segy.trace_count == 6
+    np.testing.assert_array_equal(segy.get_trace_range(1, 6), data)
+
+
+def test_validate_strict_raises(write_segy):
+    path, _ = damaged_ieee_file(write_segy)
+
+    with pytest.raises(OSError):
+        SegyFile(path).validate(strict=True)
+
+
+def test_validate_ibm_exponent(write_segy):
+    path = write_segy(np.ones((4, 20), dtype=np.float32), format=1)
+
+    # Exponents beyond the f32 range: 16^62 overflows, 16^-64 underflows
+    raw = bytearray(open(path, "rb").read())
+    for trace, word in ((1, 0x7F100000), (2, 0x01100000)):
+        at = 3600 + trace * (240 + 20 * 4) + 240 + 5 * 4
+        raw[at:at + 4] = word.to_bytes(4, "big")
+    with open(path, "wb") as f:
+        f.write(raw)
+
+    report = SegyFile(path).validate()
+
+    np.testing.assert_array_equal(report["Status"], [TRACE_OK, TRACE_IBM_EXPONENT, TRACE_IBM_EXPONENT, TRACE_OK])
+    assert report["IBM Exponent Out Of Range"] == 2
+
+
+def test_validate_clean_file(write_segy):
+    path = write_segy(np.random.default_rng(0).standard_normal((5, 30)).astype(np.float32))
+
+    report = SegyFile(path).validate(strict=True)
+
+    assert report["OK"] == report["Traces"] == 5
+    assert report["Trailing Bytes"] == 0